@@ -1,5 +1,7 @@
+import numpy as np
 from mot.lib.cl_function import SimpleCLFunction
-from mot.lib.kernel_data import Array, Zeros
+from mot.lib.kernel_data import Array, Zeros, LocalMemory
+from mot.lib.utils import LRUCache
 from mot.cl_routines.numerical_differentiation import estimate_hessian
 
 __author__ = 'Robbert Harms'
@@ -34,42 +36,6 @@ def compute_log_likelihood(ll_func, parameters, data=None, cl_runtime_info=None)
         ndarray: per problem the log likelihood, or, per problem and per sample the log likelihood.
     """
 
-    def get_cl_function():
-        nmr_params = parameters.shape[1]
-
-        if len(parameters.shape) > 2:
-            return SimpleCLFunction.from_string('''
-                void compute(global mot_float_type* parameters,
-                             global mot_float_type* log_likelihoods,
-                             void* data){
-
-                    local mot_float_type x[''' + str(nmr_params) + '''];
-
-                    for(uint sample_ind = 0; sample_ind < ''' + str(parameters.shape[2]) + '''; sample_ind++){
-                        for(uint i = 0; i < ''' + str(nmr_params) + '''; i++){
-                            x[i] = parameters[i *''' + str(parameters.shape[2]) + ''' + sample_ind];
-                        }
-
-                        double ll = ''' + ll_func.get_cl_function_name() + '''(x, data);
-                        if(get_local_id(0) == 0){
-                            log_likelihoods[sample_ind] = ll;
-                        }
-                    }
-                }
-            ''', dependencies=[ll_func])
-
-        return SimpleCLFunction.from_string('''
-            void compute(local mot_float_type* parameters,
-                         global mot_float_type* log_likelihoods,
-                         void* data){
-
-                double ll = ''' + ll_func.get_cl_function_name() + '''(parameters, data);
-                if(get_local_id(0) == 0){
-                    *(log_likelihoods) = ll;
-                }
-            }
-        ''', dependencies=[ll_func])
-
     kernel_data = {'data': data,
                    'parameters': Array(parameters, 'mot_float_type', mode='r')}
 
@@ -77,19 +43,21 @@ def compute_log_likelihood(ll_func, parameters, data=None, cl_runtime_info=None)
     if len(shape) > 2:
         kernel_data.update({
             'log_likelihoods': Zeros((shape[0], shape[2]), 'mot_float_type'),
+            'x': LocalMemory('mot_float_type', shape[1]),
+            'll_tile': LocalMemory('mot_float_type', _get_log_likelihood_tile_size(shape[2]))
         })
     else:
         kernel_data.update({
             'log_likelihoods': Zeros((shape[0],), 'mot_float_type'),
         })
 
-    get_cl_function().evaluate(kernel_data, parameters.shape[0], use_local_reduction=True,
-                               cl_runtime_info=cl_runtime_info)
+    _get_log_likelihood_function(ll_func, shape).evaluate(kernel_data, parameters.shape[0], use_local_reduction=True,
+                                                          cl_runtime_info=cl_runtime_info)
 
     return kernel_data['log_likelihoods'].get_data()
 
 
-def compute_objective_value(objective_func, parameters, data=None, cl_runtime_info=None):
+def compute_objective_value(objective_func, parameters, data=None, cl_runtime_info=None, objective_values=None):
     """Calculate and return the objective function value of the given model for the given parameters.
 
     Args:
@@ -105,9 +73,160 @@ def compute_objective_value(objective_func, parameters, data=None, cl_runtime_in
             with d problems and p parameters.
         data (mot.lib.kernel_data.KernelData): the user provided data for the ``void* data`` pointer.
         cl_runtime_info (mot.configuration.CLRuntimeInfo): the runtime information
+        objective_values (mot.lib.kernel_data.Zeros): optionally, a (d,) ``mot_float_type`` buffer to store the
+            objective function values in. Iterative callers can pass the same buffer in every iteration to prevent
+            allocating a new output buffer in every call. If not given, a new buffer is allocated.
+
+    Returns:
+        ndarray: vector matrix with per problem the objective function value. When a buffer is given, this is a copy
+            of its contents, such that the results are not overwritten by the next call using the same buffer.
+    """
+    caller_buffer = objective_values is not None
+    if not caller_buffer:
+        objective_values = Zeros((parameters.shape[0],), 'mot_float_type')
+
+    _get_objective_function(objective_func).evaluate(
+        {'data': data,
+         'parameters': Array(parameters, 'mot_float_type', mode='r'),
+         'objective_values': objective_values},
+        parameters.shape[0], use_local_reduction=True, cl_runtime_info=cl_runtime_info)
+
+    if caller_buffer:
+        return np.copy(objective_values.get_data())
+    return objective_values.get_data()
+
+
+_objective_functions = LRUCache(32)
+
+
+def _get_objective_function(objective_func):
+    """Get the CL function evaluating the objective function.
+
+    Args:
+        objective_func (mot.lib.cl_function.CLFunction): the objective function to wrap.
+
+    Returns:
+        mot.lib.cl_function.CLFunction: the function to evaluate for computing the objective values
+    """
+    key = objective_func.get_cl_code()
+    cl_function = _objective_functions.get(key)
+    if cl_function is not None:
+        return cl_function
+
+    cl_function = SimpleCLFunction.from_string('''
+        void compute(local mot_float_type* parameters,
+                     global mot_float_type* objective_values,
+                     void* data){
+
+            double value = ''' + objective_func.get_cl_function_name() + '''(parameters, data, 0);
+            if(get_local_id(0) == 0){
+                *(objective_values) = value;
+            }
+        }
+    ''', dependencies=[objective_func])
+
+    _objective_functions[key] = cl_function
+    return cl_function
+
+
+_log_likelihood_functions = LRUCache(32)
+
+
+def _get_log_likelihood_function(ll_func, shape):
+    """Get the CL function evaluating the log likelihood function for parameters of the given shape.
+
+    For sampled parameters, of shape (d, p, n), the generated code is specialized to the number of parameters and
+    samples. If the number of parameters is small, the copy of the parameters is unrolled.
+
+    Args:
+        ll_func (mot.lib.cl_function.CLFunction): The log-likelihood function.
+        shape (tuple): the shape of the parameters, either (d, p) or (d, p, n).
+
+    Returns:
+        mot.lib.cl_function.CLFunction: the function to evaluate for computing the log likelihoods
+    """
+    key = (ll_func.get_cl_code(), tuple(shape[1:]))
+    cl_function = _log_likelihood_functions.get(key)
+    if cl_function is not None:
+        return cl_function
+
+    if len(shape) > 2:
+        nmr_params, nmr_samples = shape[1:3]
+
+        copy_setup = ''
+        if nmr_params <= 32:
+            copies = ['x[{0}] = parameters[{0} * nmr_samples + sample_ind];'.format(i) for i in range(nmr_params)]
+            copy_parameters = '''
+                if(get_local_id(0) == 0){
+                    ''' + ('\n' + ' ' * 20).join(copies) + '''
+                }
+            '''
+        else:
+            copy_setup = '''
+                uint batch_range;
+                uint offset = get_workitem_batch(nmr_params, &batch_range);
+            '''
+            copy_parameters = '''
+                for(uint i = offset; i < offset + batch_range; i++){
+                    x[i] = parameters[i * nmr_samples + sample_ind];
+                }
+            '''
+
+        cl_function = SimpleCLFunction.from_string('''
+            void compute(global mot_float_type* parameters,
+                         global mot_float_type* log_likelihoods,
+                         void* data,
+                         local mot_float_type* x,
+                         local mot_float_type* ll_tile){
+
+                const uint nmr_params = ''' + str(nmr_params) + ''';
+                const uint nmr_samples = ''' + str(nmr_samples) + ''';
+                const uint tile_size = ''' + str(_get_log_likelihood_tile_size(nmr_samples)) + ''';
+                ''' + copy_setup + '''
+                for(uint tile_start = 0; tile_start < nmr_samples; tile_start += tile_size){
+                    uint tile_end = min(tile_start + tile_size, nmr_samples);
+
+                    for(uint sample_ind = tile_start; sample_ind < tile_end; sample_ind++){
+                        ''' + copy_parameters + '''
+                        barrier(CLK_LOCAL_MEM_FENCE);
+
+                        double ll = ''' + ll_func.get_cl_function_name() + '''(x, data);
+                        if(get_local_id(0) == 0){
+                            ll_tile[sample_ind - tile_start] = ll;
+                        }
+                        barrier(CLK_LOCAL_MEM_FENCE);
+                    }
+
+                    event_t copy_event = async_work_group_copy(
+                        log_likelihoods + tile_start, ll_tile, tile_end - tile_start, 0);
+                    wait_group_events(1, &copy_event);
+                }
+            }
+        ''', dependencies=[ll_func])
+    else:
+        cl_function = SimpleCLFunction.from_string('''
+            void compute(local mot_float_type* parameters,
+                         global mot_float_type* log_likelihoods,
+                         void* data){
+
+                double ll = ''' + ll_func.get_cl_function_name() + '''(parameters, data);
+                if(get_local_id(0) == 0){
+                    *(log_likelihoods) = ll;
+                }
+            }
+        ''', dependencies=[ll_func])
+
+    _log_likelihood_functions[key] = cl_function
+    return cl_function
+
+
+def _get_log_likelihood_tile_size(nmr_samples):
+    """Get the number of log likelihoods to buffer in local memory before writing them to global memory.
+
+    Args:
+        nmr_samples (int): the number of samples per problem
 
     Returns:
-        ndarray: vector matrix with per problem the objective function value
+        int: the number of samples per tile
     """
-    return objective_func.evaluate({'data': data, 'parameters': Array(parameters, 'mot_float_type', mode='r')},
-                                   parameters.shape[0], use_local_reduction=True, cl_runtime_info=cl_runtime_info)
+    return min(nmr_samples, 1024)
@@ -29,9 +29,11 @@ __email__ = "robbert@xkls.nl"
 
 For any of the AbstractCLRoutines it holds that if no suitable defaults are given we use the ones provided by this
 module. This entire module acts as a singleton containing the current runtime configuration.
+
+The CL environments are initialized lazily on first use, such that importing MOT does not scan all the OpenCL devices.
 """
 _config = {
-    'cl_environments': CLEnvironmentFactory.smart_device_selection(preferred_device_type='GPU'),
+    'cl_environments': None,
     'compile_flags': ['-cl-denorms-are-zero', '-cl-mad-enable', '-cl-no-signed-zeros'],
     'double_precision': False,
     'load_balancer': EvenDistribution()
@@ -44,6 +46,8 @@ def get_cl_environments():
     Returns:
         list of CLEnvironment: the current list of CL environments.
     """
+    if _config['cl_environments'] is None:
+        _config['cl_environments'] = CLEnvironmentFactory.smart_device_selection(preferred_device_type='GPU')
     return _config['cl_environments']
 
 
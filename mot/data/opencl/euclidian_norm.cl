@@ -20,7 +20,7 @@
 /*****************************************************************************/
 /*  euclidian_norm (Euclidean norm)                                          */
 /*****************************************************************************/
-%(MEMTYPE)s euclidian_norm_%(MEMSPACE)s(const %(MEMSPACE)s %(MEMTYPE)s* const x, const int n){
+%(MEMTYPE)s %(FUNCTION_NAME)s(%(MEMSPACE)s const %(MEMTYPE)s* const x, const int n){
 /*     Given an n-vector x, this function calculates the
  *     euclidean norm of x.
  *
@@ -35,6 +35,12 @@
  *     restrictions on these constants are that LM_SQRT_DWARF**2 not
  *     underflow and LM_SQRT_GIANT**2 not overflow.
  *
+ *     For vectors in global or constant memory, the plain sum of
+ *     squares is first computed in blocks of four values. This is
+ *     returned if it did not overflow and is large enough to not
+ *     have suffered from underflow, else we fall back to the
+ *     scaled sums.
+ *
  *     Parameters
  *
  *      n is a positive integer input variable.
@@ -44,6 +50,27 @@
     int i;
     %(MEMTYPE)s s1, s2, s3, xabs, x1max, x3max, sqrt_n_tmp;
 
+#if %(VECTORIZED)s
+    double4 v;
+    double4 sum4 = (double4)(0);
+    double sum;
+    const int nmr_blocks = n / 4;
+
+    #pragma unroll 4
+    for(i = 0; i < nmr_blocks; i++){
+        v = convert_double4(vload4(i, x));
+        sum4 = fma(v, v, sum4);
+    }
+    sum = (sum4.x + sum4.y) + (sum4.z + sum4.w);
+    for(i = nmr_blocks * 4; i < n; i++){
+        sum = fma((double)x[i], (double)x[i], sum);
+    }
+
+    if(isfinite(sum) && sum >= ENORM_SQRT_DWARF){
+        return sqrt(sum);
+    }
+#endif
+
     s1 = 0;
     s2 = 0;
     s3 = 0;
@@ -94,4 +121,9 @@
 
 } /*** euclidian_norm. ***/
 
+/* the name under which this function was available before */
+#ifndef euclidian_norm_%(MEMSPACE)s
+#define euclidian_norm_%(MEMSPACE)s %(FUNCTION_NAME)s
+#endif
+
 #endif // EUCLIDIAN_NORM_%(MEMSPACE)s_%(MEMTYPE)s_CL
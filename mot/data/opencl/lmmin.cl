@@ -163,6 +163,7 @@ int lmmin(local mot_float_type * const model_parameters, void* data,
     /* Initialize diag. */
     if (!SCALE_DIAG) {
         if(get_local_id(0) == 0){
+            %(UNROLL_PARAMS)s
             for (j = 0; j < %(NMR_PARAMS)s; j++)
                 diag[j] = 1;
         }
@@ -262,6 +263,7 @@ int lmmin(local mot_float_type * const model_parameters, void* data,
             if(get_local_id(0) == 0){
                 if (SCALE_DIAG) {
                     /* diag := norms of the columns of the initial Jacobian */
+                    %(UNROLL_PARAMS)s
                     for (j = 0; j < %(NMR_PARAMS)s; j++){
                         diag[j] = 1;
                         if(wa2[j]){
@@ -269,6 +271,7 @@ int lmmin(local mot_float_type * const model_parameters, void* data,
                         }
                     }
                     /* xnorm := || D x || */
+                    %(UNROLL_PARAMS)s
                     for (j = 0; j < %(NMR_PARAMS)s; j++){
                         wa3[j] = diag[j] * model_parameters[j];
                     }
@@ -293,6 +296,7 @@ int lmmin(local mot_float_type * const model_parameters, void* data,
         } else {
             if(get_local_id(0) == 0){
                 if (SCALE_DIAG) {
+                    %(UNROLL_PARAMS)s
                     for (j = 0; j < %(NMR_PARAMS)s; j++){
                         diag[j] = max( diag[j], wa2[j] );
                     }
@@ -346,6 +350,7 @@ int lmmin(local mot_float_type * const model_parameters, void* data,
 
             if(get_local_id(0) == 0){
                 /** Evaluate the function at x + p. **/
+                %(UNROLL_PARAMS)s
                 for (j = 0; j < %(NMR_PARAMS)s; j++){
                     wa2[j] = model_parameters[j] - wa1[j];
                 }
@@ -407,11 +412,13 @@ int lmmin(local mot_float_type * const model_parameters, void* data,
 				if(get_local_id(0) == 0){
                     /* Update x, fvec, and their norms */
                     if (SCALE_DIAG) {
+                        %(UNROLL_PARAMS)s
                         for (j = 0; j < %(NMR_PARAMS)s; j++) {
                             model_parameters[j] = wa2[j];
                             wa2[j] = diag[j] * model_parameters[j];
                         }
                     } else {
+                        %(UNROLL_PARAMS)s
                         for (j = 0; j < %(NMR_PARAMS)s; j++){
                             model_parameters[j] = wa2[j];
                         }
@@ -80,6 +80,7 @@ void powell_init_search_directions(local mot_float_type* search_directions){
     uint params_batch_offset = get_workitem_batch(%(NMR_PARAMS)r, &params_batch_range);
     int j;
     for(int i = params_batch_offset; i < params_batch_offset + params_batch_range; i++){
+        %(UNROLL_PARAMS)s
         for(j=0; j < %(NMR_PARAMS)r; j++){
             search_directions[i * %(NMR_PARAMS)r + j] = (i == j ? 1.0 : 0.0);
         }
@@ -367,6 +368,7 @@ int powell(local mot_float_type* model_parameters, void* data,
                 }
                 else{
                     for(i = params_batch_offset; i < params_batch_offset + params_batch_range; i++){
+                        %(UNROLL_PARAMS)s
                         for(j = 0; j < %(NMR_PARAMS)r - 1; j++){
                             search_directions[i * %(NMR_PARAMS)r + j] = search_directions[i * %(NMR_PARAMS)r + j+1];
                         }
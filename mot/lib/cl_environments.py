@@ -1,4 +1,5 @@
 import pyopencl as cl
+import pyopencl.tools
 from mot.lib.utils import device_supports_double, device_type_from_string
 
 __author__ = 'Robbert Harms'
@@ -8,6 +9,16 @@ __maintainer__ = "Robbert Harms"
 __email__ = "robbert@xkls.nl"
 
 
+_PLATFORM_INFO_KEYS = ('NAME', 'VENDOR', 'VERSION', 'PROFILE', 'EXTENSIONS')
+"""The platform information printed in the representation of a CL environment."""
+
+_DEVICE_INFO_KEYS = ('NAME', 'VENDOR', 'VERSION', 'DRIVER_VERSION', 'OPENCL_C_VERSION', 'TYPE',
+                     'MAX_COMPUTE_UNITS', 'MAX_CLOCK_FREQUENCY', 'MAX_WORK_GROUP_SIZE', 'MAX_WORK_ITEM_SIZES',
+                     'GLOBAL_MEM_SIZE', 'LOCAL_MEM_SIZE', 'MAX_MEM_ALLOC_SIZE', 'MAX_CONSTANT_BUFFER_SIZE',
+                     'HOST_UNIFIED_MEMORY', 'DOUBLE_FP_CONFIG', 'EXTENSIONS')
+"""The device information printed in the representation of a CL environment."""
+
+
 class CLEnvironment:
 
     def __init__(self, platform, context, device):
@@ -15,13 +26,29 @@ class CLEnvironment:
 
         Args:
             platform (cl.Platform): An PyOpenCL platform.
-            context (cl.Context): The CL context
+            context (cl.Context or Callable[[], cl.Context]): The CL context, or a function returning the CL context.
+                With a function, the context (and the queues) are only created on first use.
             device (cl.Device): The CL device
         """
         self._platform = platform
-        self._context = context
+        if isinstance(context, cl.Context):
+            self._context = context
+            self._context_factory = None
+        else:
+            self._context = None
+            self._context_factory = context
         self._device = device
-        self._queue = cl.CommandQueue(self._context, device=device)
+        self._queue = None
+        self._has_unified_memory = None
+
+        self._device_type = device.get_info(cl.device_info.TYPE)
+        self._is_gpu = self._device_type == cl.device_type.GPU
+        self._is_cpu = self._device_type == cl.device_type.CPU
+        self._supports_double = device_supports_double(device)
+        self._device_name = device.name
+        self._platform_name = platform.name
+        self._info_cache = {}
+        self._memory_pool = None
 
     @property
     def context(self):
@@ -30,6 +57,8 @@ class CLEnvironment:
         Returns:
             cl.Context: a PyOpenCL device context
         """
+        if self._context is None:
+            self._context = self._context_factory()
         return self._context
 
     @property
@@ -39,8 +68,35 @@ class CLEnvironment:
         Returns:
             cl.Queue: a PyOpenCL queue
         """
+        if self._queue is None:
+            self._queue = cl.CommandQueue(self.context, device=self._device)
         return self._queue
 
+    @property
+    def memory_pool(self):
+        """Get a memory pool for allocating device buffers in this context.
+
+        Buffers allocated from this pool are returned to the pool when they are garbage collected, such that
+        recurring allocations of the same size do not have to go through the driver every time.
+
+        Returns:
+            pyopencl.tools.MemoryPool: the memory pool for this environment
+        """
+        if self._memory_pool is None:
+            self._memory_pool = cl.tools.MemoryPool(cl.tools.ImmediateAllocator(self.queue))
+        return self._memory_pool
+
+    def allocate(self, nbytes):
+        """Allocate a device buffer of the given size from the memory pool.
+
+        Args:
+            nbytes (int): the size of the buffer in bytes
+
+        Returns:
+            pyopencl.tools.PooledBuffer: a read and writable buffer which can be used as a kernel argument.
+        """
+        return self.memory_pool.allocate(nbytes)
+
     @property
     def supports_double(self):
         """Check if the device listed by this environment supports double
@@ -48,7 +104,24 @@ class CLEnvironment:
         Returns:
             boolean: True if the device supports double, false otherwise.
         """
-        return device_supports_double(self.device)
+        return self._supports_double
+
+    @property
+    def has_unified_memory(self):
+        """Check if the device shares its memory with the host.
+
+        This is typically the case for CPU's and integrated GPU's (APU's, mobile GPU's). On these devices we can let the
+        device work directly on the host memory, while on discrete devices it is better to use device side buffers.
+
+        Returns:
+            boolean: True if the device and the host share a unified memory subsystem, False otherwise.
+        """
+        if self._has_unified_memory is None:
+            try:
+                self._has_unified_memory = bool(self._device.get_info(cl.device_info.HOST_UNIFIED_MEMORY))
+            except (cl.LogicError, AttributeError):
+                self._has_unified_memory = self.is_cpu
+        return self._has_unified_memory
 
     @property
     def platform(self):
@@ -75,7 +148,7 @@ class CLEnvironment:
         Returns:
             boolean: True if the device is an GPU, false otherwise.
         """
-        return self._device.get_info(cl.device_info.TYPE) == cl.device_type.GPU
+        return self._is_gpu
 
     @property
     def is_cpu(self):
@@ -84,7 +157,7 @@ class CLEnvironment:
         Returns:
             boolean: True if the device is an CPU, false otherwise.
         """
-        return self._device.get_info(cl.device_info.TYPE) == cl.device_type.CPU
+        return self._is_cpu
 
     @property
     def device_type(self):
@@ -93,11 +166,11 @@ class CLEnvironment:
         Returns:
             the device type of this device.
         """
-        return self._device.get_info(cl.device_info.TYPE)
+        return self._device_type
 
     def __str__(self):
-        s = 'GPU' if self.is_gpu else 'CPU'
-        s += ' - ' + self.device.name + ' (' + self.platform.name + ')'
+        s = 'GPU' if self._is_gpu else 'CPU'
+        s += ' - ' + self._device_name + ' (' + self._platform_name + ')'
         return s
 
     def __repr__(self):
@@ -114,70 +187,143 @@ class CLEnvironment:
         return s
 
     def _print_info(self, obj, info_cls):
-        s = ''
+        if (obj, info_cls) in self._info_cache:
+            return self._info_cache[(obj, info_cls)]
 
         def format_title(title_str):
             title_str = title_str.lower()
             title_str = title_str.replace('_', ' ')
             return title_str
 
-        for info_name in sorted(dir(info_cls)):
-            if not info_name.startswith("_") and info_name != "to_string":
-                info = getattr(info_cls, info_name)
-
-                try:
-                    info_value = obj.get_info(info)
-                except cl.LogicError:
-                    info_value = "<error>"
-
-                if info_cls == cl.device_info and info_name == "PARTITION_TYPES_EXT" and isinstance(info_value, list):
-                    prop_value = [cl.device_partition_property_ext.to_string(v, "<unknown device "
-                                                                                "partition property %d>")
-                                  for v in info_value]
-
-                    s += ("%s: %s" % (format_title(info_name), prop_value)) + "\n"
-                else:
-                    try:
-                        s += ("%s: %s" % (format_title(info_name), info_value)) + "\n"
-                    except cl.LogicError:
-                        s += ("%s: <error>" % info_name) + "\n"
+        if info_cls == cl.device_info:
+            info_names = _DEVICE_INFO_KEYS
+        else:
+            info_names = _PLATFORM_INFO_KEYS
+
+        s = ''
+        for info_name in info_names:
+            info = getattr(info_cls, info_name, None)
+            if info is None:
+                continue
+
+            try:
+                info_value = obj.get_info(info)
+            except (cl.LogicError, cl.RuntimeError):
+                info_value = "<error>"
+
+            s += ("%s: %s" % (format_title(info_name), info_value)) + "\n"
         s += "\n"
+
+        self._info_cache[(obj, info_cls)] = s
         return s
 
     def __hash__(self):
-        return hash(self._platform) + hash(self._context) + hash(self._device) + hash(self._queue)
+        return hash(self._platform) + hash(self._device)
+
+
+class _PlatformContext:
+
+    def __init__(self, devices):
+        """A CL context over the given devices, which is only created when it is first requested.
+
+        Args:
+            devices (List[cl.Device]): the devices to create the context for
+        """
+        self._devices = devices
+        self._context = None
+
+    def __call__(self):
+        if self._context is None:
+            self._context = cl.Context(self._devices)
+        return self._context
 
 
 def _initialize_cl_environment_cache():
     """Initialize a cache of CL environments.
 
-    This cache holds, per platform a cache with all applicable CL environments.
+    This cache holds, per platform a cache with all applicable CL environments. Only devices supporting double
+    precision are included. The environments of a platform share a single context over these devices, which is
+    only created when one of the environments is first requested from the :class:`CLEnvironmentFactory`. Platforms
+    on which creating the context fails are then removed from the cache.
 
     Returns:
         dict: a dictionary mapping platforms to CLEnvironment
     """
     cache = {}
     for platform in cl.get_platforms():
-        devices = platform.get_devices()
+        devices = [device for device in platform.get_devices() if device_supports_double(device)]
 
         if len(devices) == 0:
             continue
 
-        try:
-            context = cl.Context(devices)
-        except cl.RuntimeError:
-            continue
-        items = []
-        for device in devices:
-            if device_supports_double(device):
-                env = CLEnvironment(platform, context, device)
-                items.append(env)
-        cache[platform] = items
+        context = _PlatformContext(devices)
+        cache[platform] = [CLEnvironment(platform, context, device) for device in devices]
 
     return cache
 
 
-_cl_environment_cache = _initialize_cl_environment_cache()
+_cl_environment_cache = None
+
+
+def _get_cl_environment_cache():
+    """Get the cache of CL environments, initializing it on first use.
+
+    This prevents enumerating all the platforms and creating the CL contexts at import time.
+
+    Returns:
+        dict: a dictionary mapping platforms to CLEnvironment
+    """
+    global _cl_environment_cache
+    if _cl_environment_cache is None:
+        _cl_environment_cache = _initialize_cl_environment_cache()
+    return _cl_environment_cache
+
+
+def _iter_cl_environments(cl_device_type=None, platform=None):
+    """Iterate over the cached device environments, optionally only of the indicated type.
+
+    Args:
+        cl_device_type (cl.device_type.* or string): The type of the device we want,
+            can be a opencl device type or a string matching 'GPU' or 'CPU'.
+        platform (opencl platform): The opencl platform to select the devices from
+
+    Yields:
+        CLEnvironment: the matching CL device environments
+    """
+    if isinstance(cl_device_type, str):
+        cl_device_type = device_type_from_string(cl_device_type)
+
+    environment_cache = _get_cl_environment_cache()
+
+    if platform is None:
+        platforms = list(environment_cache.keys())
+    else:
+        platforms = [platform]
+
+    for platform in platforms:
+        for env in environment_cache.get(platform, []):
+            if not cl_device_type or env.device_type == cl_device_type:
+                yield env
+
+
+def _has_working_context(cl_environment):
+    """Check if the context of the given environment can be created.
+
+    Some platforms fail on creating a context. If so, all the environments of that platform are removed from the
+    cache of CL environments, such that they are not returned anymore.
+
+    Args:
+        cl_environment (CLEnvironment): the environment to check
+
+    Returns:
+        boolean: if the context of this environment could be created
+    """
+    try:
+        cl_environment.context
+        return True
+    except cl.RuntimeError:
+        _get_cl_environment_cache().pop(cl_environment.platform, None)
+        return False
 
 
 class CLEnvironmentFactory:
@@ -198,16 +344,19 @@ class CLEnvironmentFactory:
         Returns:
             list of CLEnvironment: List with one element, the CL runtime environment requested.
         """
-        cl_environments = CLEnvironmentFactory.all_devices(cl_device_type=cl_device_type, platform=platform)
+        # the first matching environment whose context can be created, this only creates the context we return
+        cl_environment = next((env for env in _iter_cl_environments(cl_device_type=cl_device_type, platform=platform)
+                               if _has_working_context(env)), None)
 
-        if len(cl_environments):
-            return cl_environments[0]
+        if cl_environment is not None:
+            return cl_environment
         else:
             if fallback_to_any_device_type:
                 return CLEnvironmentFactory.single_device(cl_device_type=None)
             else:
-                raise ValueError('No suitable devices of the specified type ({}) found.'.format(
-                    cl.device_type.to_string(cl_device_type)))
+                if not isinstance(cl_device_type, str):
+                    cl_device_type = cl.device_type.to_string(cl_device_type)
+                raise ValueError('No suitable devices of the specified type ({}) found.'.format(cl_device_type))
 
     @staticmethod
     def all_devices(cl_device_type=None, platform=None):
@@ -223,27 +372,8 @@ class CLEnvironmentFactory:
         Returns:
             list of CLEnvironment: List with the CL device environments.
         """
-        if isinstance(cl_device_type, str):
-            cl_device_type = device_type_from_string(cl_device_type)
-
-        cl_environments = []
-
-        if platform is None:
-            platforms = _cl_environment_cache.keys()
-        else:
-            platforms = [platform]
-
-        for platform in platforms:
-            cached_envs = _cl_environment_cache[platform]
-
-            if cl_device_type:
-                for env in cached_envs:
-                    if env.device.get_info(cl.device_info.TYPE) == cl_device_type:
-                        cl_environments.append(env)
-            else:
-                cl_environments.extend(cached_envs)
-
-        return cl_environments
+        return [env for env in _iter_cl_environments(cl_device_type=cl_device_type, platform=platform)
+                if _has_working_context(env)]
 
     @staticmethod
     def smart_device_selection(preferred_device_type=None):
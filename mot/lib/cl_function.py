@@ -1,12 +1,15 @@
 from collections import Iterable
 from copy import copy
+from functools import lru_cache
+import sys
 import tatsu
 from textwrap import dedent, indent
 import pyopencl as cl
 from mot.configuration import CLRuntimeInfo
 from mot.lib.cl_processors import MultiDeviceProcessor
 from mot.lib.kernel_data import Zeros
-from mot.lib.utils import split_cl_function, convert_inputs_to_kernel_data, get_cl_utility_definitions
+from mot.lib.utils import split_cl_function, convert_inputs_to_kernel_data, get_cl_utility_definitions, \
+    LRUCache
 
 __author__ = 'Robbert Harms'
 __date__ = '2017-08-31'
@@ -15,6 +18,10 @@ __email__ = 'robbert@xkls.nl'
 __licence__ = 'LGPL v3'
 
 
+_compilation_cache = LRUCache(64)
+"""Process wide cache of compiled CL programs and their kernels, keyed by kernel source, context and compile flags."""
+
+
 class CLCodeObject:
     """Interface for basic code objects."""
 
@@ -209,12 +216,13 @@ class SimpleCLFunction(CLFunction):
         """
         super().__init__()
         self._return_type = return_type
-        self._function_name = cl_function_name
+        self._function_name = sys.intern(str(cl_function_name))
         self._parameter_list = self._resolve_parameters(parameter_list)
         self._cl_body = cl_body
         self._dependencies = dependencies or []
         self._is_kernel_func = is_kernel_func
-        self._compilation_cache = {}
+        self._cl_code = None  # the CL code is rendered once, on the first request
+        self._cl_code_without_dependencies = None
 
     @classmethod
     def from_string(cls, cl_function, dependencies=()):
@@ -294,6 +302,19 @@ class SimpleCLFunction(CLFunction):
             parameters=', '.join(self._get_parameter_signatures())))
 
     def get_cl_code(self):
+        if self._cl_code is None:
+            self._cl_code = self._get_cl_dependency_code() + self._get_cl_code_without_dependencies()
+        return self._cl_code
+
+    def _get_cl_code_without_dependencies(self):
+        """Get the CL code of only this function, without the code of the dependencies.
+
+        Returns:
+            str: the CL code of this function, wrapped in an include guard
+        """
+        if self._cl_code_without_dependencies is not None:
+            return self._cl_code_without_dependencies
+
         cl_code = dedent('''
             {kernel} {return_type} {cl_function_name}({parameters}){{
             {body}
@@ -304,14 +325,14 @@ class SimpleCLFunction(CLFunction):
                    parameters=', '.join(self._get_parameter_signatures()),
                    body=indent(dedent(self._cl_body), ' '*4*4)))
 
-        dependencies = self._get_cl_dependency_code()
-        return dependencies + dedent('''
+        self._cl_code_without_dependencies = dedent('''
             #ifndef {inclusion_guard_name}
             #define {inclusion_guard_name}
             {code}
             #endif // {inclusion_guard_name}
         '''.format(inclusion_guard_name='INCLUDE_GUARD_{}'.format(self.get_cl_function_name()),
                    code=indent('\n' + cl_code + '\n', ' ' * 4 * 3)))
+        return self._cl_code_without_dependencies
 
     def get_cl_body(self):
         return self._cl_body
@@ -341,14 +362,9 @@ class SimpleCLFunction(CLFunction):
             return kernel_source
 
         def get_kernels(kernel_source, function_name):
-            hashed_source = hash(kernel_source)
             kernels = {}
             for env in cl_runtime_info.cl_environments:
-                key = (hashed_source, env.context, cl_runtime_info.compile_flags)
-                if key not in self._compilation_cache:
-                    self._compilation_cache[key] = cl.Program(
-                        env.context, kernel_source).build(' '.join(cl_runtime_info.compile_flags))
-                kernels[env] = getattr(self._compilation_cache[key], function_name)
+                kernels[env] = _get_kernel(env, kernel_source, cl_runtime_info.compile_flags, function_name)
             return kernels
 
         cl_function, kernel_data = resolve_cl_function_and_kernel_data()
@@ -391,13 +407,34 @@ class SimpleCLFunction(CLFunction):
     def _get_cl_dependency_code(self):
         """Get the CL code for all the CL code for all the dependencies.
 
+        This walks the complete dependency graph once, such that code shared by multiple dependencies is only
+        included once, after the code it depends on.
+
         Returns:
             str: The CL code with the actual code.
         """
-        code = ''
+        code = []
+        included = set()
+
+        def add_code(code_object):
+            # only walk into the dependencies ourselves if the code object does not add code of its own
+            if isinstance(code_object, SimpleCLFunction) \
+                    and type(code_object).get_cl_code is SimpleCLFunction.get_cl_code:
+                own_code = code_object._get_cl_code_without_dependencies()
+                if own_code not in included:
+                    included.add(own_code)
+                    for dependency in code_object.get_dependencies():
+                        add_code(dependency)
+                    code.append(own_code)
+            else:
+                object_code = code_object.get_cl_code()
+                if object_code not in included:
+                    included.add(object_code)
+                    code.append(object_code)
+
         for d in self._dependencies:
-            code += d.get_cl_code() + "\n"
-        return code
+            add_code(d)
+        return ''.join(c + '\n' for c in code)
 
     @staticmethod
     def _resolve_parameters(parameter_list):
@@ -575,6 +612,14 @@ class SimpleCLFunctionParameter(CLFunctionParameter):
     def __init__(self, declaration):
         """Creates a new function parameter for the CL functions.
 
+        Args:
+            declaration (str): the declaration of this parameter. For example ``global int foo``.
+        """
+        self.__dict__.update({k: copy(v) for k, v in _parse_parameter_declaration(declaration).items()})
+
+    def _parse_declaration(self, declaration):
+        """Parse the given declaration and set the attributes of this parameter.
+
         Args:
             declaration (str): the declaration of this parameter. For example ``global int foo``.
         """
@@ -620,7 +665,7 @@ class SimpleCLFunctionParameter(CLFunctionParameter):
                 return ast
 
             def name(self, ast):
-                param._name = ast
+                param._name = sys.intern(str(ast))
                 return ast
 
             def array_size(self, ast):
@@ -635,7 +680,7 @@ class SimpleCLFunctionParameter(CLFunctionParameter):
 
     def get_renamed(self, name):
         new_param = copy(self)
-        new_param._name = name
+        new_param._name = sys.intern(str(name))
         return new_param
 
     def get_declaration(self):
@@ -697,3 +742,50 @@ class SimpleCLFunctionParameter(CLFunctionParameter):
     @property
     def is_array_type(self):
         return len(self.array_sizes) > 0
+
+
+@lru_cache(maxsize=256)
+def _parse_parameter_declaration(declaration):
+    """Parse the given parameter declaration.
+
+    Parsing is deterministic, as such recurring declarations are only parsed once.
+
+    Args:
+        declaration (str): the declaration of the parameter. For example ``global int foo``.
+
+    Returns:
+        dict: the attributes of a :class:`SimpleCLFunctionParameter` with the given declaration
+    """
+    param = SimpleCLFunctionParameter.__new__(SimpleCLFunctionParameter)
+    param._parse_declaration(declaration)
+    return param.__dict__
+
+
+def _get_kernel(cl_environment, kernel_source, compile_flags, kernel_name):
+    """Get the kernel with the given name from the compiled CL program for the given source.
+
+    This uses a process wide cache of compiled programs, shared by all CL functions, such that functions generating
+    the same kernel source only need to be compiled once per context. Next to every program we cache the kernels
+    retrieved from it, per environment and kernel name, such that repeated evaluations reuse the same kernel objects.
+    The least recently used programs, together with their kernels, are evicted when the cache is full.
+
+    Args:
+        cl_environment (mot.lib.cl_environments.CLEnvironment): the environment to get the kernel for
+        kernel_source (str): the complete kernel source
+        compile_flags (tuple): the compile flags to use
+        kernel_name (str): the name of the kernel function
+
+    Returns:
+        cl.Kernel: the kernel
+    """
+    key = (kernel_source, cl_environment.context, tuple(compile_flags))
+    cached = _compilation_cache.get(key)
+    if cached is None:
+        cached = (cl.Program(cl_environment.context, kernel_source).build(' '.join(compile_flags)), {})
+        _compilation_cache[key] = cached
+    program, kernels = cached
+
+    kernel_key = (cl_environment, kernel_name)
+    if kernel_key not in kernels:
+        kernels[kernel_key] = cl.Kernel(program, kernel_name)
+    return kernels[kernel_key]
@@ -4,6 +4,7 @@ __maintainer__ = 'Robbert Harms'
 __email__ = 'robbert@xkls.nl'
 __licence__ = 'LGPL v3'
 
+from itertools import chain
 import pyopencl as cl
 
 
@@ -81,14 +82,18 @@ class MultiDeviceProcessor(Processor):
 
     def process(self, is_blocking=False, wait_for=None):
         if self._do_data_transfers:
+            transfer_events = [wait_for or {}]
             for ind, kernel_data in enumerate(self._kernel_data.values()):
-                wait_for = kernel_data.enqueue_device_access(self._cl_environments, is_blocking=False,
-                                                             wait_for=wait_for)
+                transfer_events.append(kernel_data.enqueue_device_access(self._cl_environments, is_blocking=False,
+                                                                         wait_for=wait_for))
+            wait_for = _join_events(self._cl_environments, transfer_events)
 
         events = {}
         for worker in self._subprocessors:
             events.update(worker.process(wait_for=wait_for))
-            worker.flush()
+
+        # flush only after all the work has been enqueued, saving a driver round trip per kernel submission
+        self.flush()
 
         if self._do_data_transfers:
             for ind, kernel_data in enumerate(self._kernel_data.values()):
@@ -124,7 +129,8 @@ class ProcessKernel(Processor):
         self._cl_environment = cl_environment
         self._global_nmr_instances = global_nmr_instances
         self._instance_offset = instance_offset or 0
-        self._kernel.set_scalar_arg_dtypes(self._flatten_list([d.get_scalar_arg_dtypes() for d in self._kernel_data]))
+        self._kernel.set_scalar_arg_dtypes(list(chain.from_iterable(d.get_scalar_arg_dtypes()
+                                                                    for d in self._kernel_data)))
         self._workgroup_size = workgroup_size
 
     def process(self, is_blocking=False, wait_for=None):
@@ -138,8 +144,8 @@ class ProcessKernel(Processor):
             self._cl_environment.queue,
             (int(self._global_nmr_instances * self._workgroup_size),),
             (int(self._workgroup_size),),
-            *self._flatten_list([data.get_kernel_inputs(self._cl_environment, self._workgroup_size)
-                                 for data in self._kernel_data]),
+            *chain.from_iterable(data.get_kernel_inputs(self._cl_environment, self._workgroup_size)
+                                 for data in self._kernel_data),
             global_offset=(int(self._instance_offset * self._workgroup_size),),
             wait_for=wait_for)
 
@@ -154,12 +160,6 @@ class ProcessKernel(Processor):
     def finish(self):
         self._cl_environment.queue.finish()
 
-    def _flatten_list(self, l):
-        return_l = []
-        for e in l:
-            return_l.extend(e)
-        return return_l
-
 
 class DeviceAccess(Processor):
 
@@ -175,10 +175,11 @@ class DeviceAccess(Processor):
         self._cl_environments = cl_environments
 
     def process(self, is_blocking=False, wait_for=None):
-        events = None
+        events = []
         for ind, kernel_data in enumerate(self._kernel_data):
-            events = kernel_data.enqueue_device_access(self._cl_environments, is_blocking=False, wait_for=wait_for)
-        return events
+            events.append(kernel_data.enqueue_device_access(self._cl_environments, is_blocking=False,
+                                                            wait_for=wait_for))
+        return _join_events(self._cl_environments, events)
 
     def flush(self):
         for env in self._cl_environments:
@@ -215,3 +216,26 @@ class HostAccess(Processor):
     def finish(self):
         for env in self._cl_environments:
             env.queue.finish()
+
+
+def _join_events(cl_environments, events):
+    """Join the events of multiple processing steps into a single event per CL environment.
+
+    Every kernel data item returns its own transfer events. This enqueues, for every environment, a marker on its
+    queue which waits on all the given events sharing the environment's context, such that the kernels can wait on
+    all the transfers instead of only on those of the last kernel data item.
+
+    Args:
+        cl_environments (List[mot.lib.cl_environments.CLEnvironment]): the CL environments to join the events for
+        events (List[Dict[CLEnvironment: cl.Event]]): the events to join
+
+    Returns:
+        Dict[CLEnvironment: cl.Event]: per CL environment a single event to wait on
+    """
+    joined = {}
+    for env in cl_environments:
+        wait_list = [event for event_dict in events for event_env, event in event_dict.items()
+                     if event_env.context is env.context]
+        if wait_list:
+            joined[env] = cl.enqueue_marker(env.queue, wait_for=wait_list)
+    return joined
@@ -657,7 +657,7 @@ class LocalMemory(KernelData):
 class Array(KernelData):
 
     def __init__(self, data, ctype=None, as_scalar=False, parallelize_over_first_dimension=True,
-                 mode='rw', use_host_ptr=True):
+                 mode='rw', use_host_ptr=None):
         """Loads the given array as a buffer into one or more OpenCL contexts.
 
         By default, this expects multi-dimensional arrays (n, m, k, ...) which holds a (m, k, ...) for every data
@@ -682,7 +682,9 @@ class Array(KernelData):
                 This defines how the device is planned on accessing this array, and, defines if we will read the
                 data back after applying a kernel (if 'w' is included we will write data back, else, not).
             use_host_ptr (boolean): if set, we will use the USE_HOST_PTR flag and use map/unmap for data transfers
-                if not set, we create a device side buffer and use explicit read and write commands to transfer the data
+                if not set, we create a device side buffer and use explicit transfers to load the data.
+                If None (the default), we decide per device. Devices sharing their memory with the host (CPU's and
+                integrated GPU's) use the host pointer, discrete devices get a device side buffer.
         """
         if isinstance(data, (list, tuple)):
             data = np.array(data)
@@ -703,6 +705,7 @@ class Array(KernelData):
 
         self._use_host_ptr = use_host_ptr
         self._buffer_cache = {}  # caching the buffers per context
+        self._host_ptr_cache = {}  # per context, if the cached buffer uses the host pointer
 
         self._data_length = 1
         if len(self._data.shape):
@@ -767,6 +770,7 @@ class Array(KernelData):
                 self._backup_data_reference = self._data
                 self._data = new_data
                 self._buffer_cache = {}  # cache is invalidated
+                self._host_ptr_cache = {}
 
         # data length may change when an CL vector type is converted from (n, 3) shape to (n,)
         self._data_length = 1
@@ -878,7 +882,7 @@ class Array(KernelData):
                         wait_list.append(wait_event)
 
                 if not any(e.context is env.context for e in events.keys()):
-                    if self._use_host_ptr:
+                    if self._host_ptr_cache[context]:
                         _, event = cl.enqueue_map_buffer(
                             env.queue, self._buffer_cache[context],
                             cl.map_flags.READ, 0, self._data.shape, self._data.dtype,
@@ -905,19 +909,28 @@ class Array(KernelData):
         wait_for = wait_for or {}
         events = {}
 
-        if not self._use_host_ptr:
-            for env in cl_environments:
-                context = env.context
+        for env in cl_environments:
+            context = env.context
 
+            if not self._host_ptr_cache[context] and not any(e.context is env.context for e in events.keys()):
                 wait_list = []
                 for wait_env, wait_event in wait_for.items():
                     if wait_env.context is context:
                         wait_list.append(wait_event)
 
-                if not any(e.context is env.context for e in events.keys()):
+                if is_blocking and env.has_unified_memory:
+                    # write through a mapping, invalidating the old contents, to avoid a driver side staging copy.
+                    # Mapping blocks until the queued work is done, as such this is only used for blocking uploads.
+                    mapped, _ = cl.enqueue_map_buffer(
+                        env.queue, self._buffer_cache[context],
+                        cl.map_flags.WRITE_INVALIDATE_REGION, 0, self._data.shape, self._data.dtype,
+                        order="C", wait_for=wait_list, is_blocking=True)
+                    np.copyto(mapped, self._data)
+                    event = mapped.base.release(env.queue)
+                else:
                     event = cl.enqueue_copy(env.queue, self._buffer_cache[context], self._data,
                                             is_blocking=False, wait_for=wait_list)
-                    events[env] = event
+                events[env] = event
 
         if is_blocking:
             for env in cl_environments:
@@ -938,12 +951,17 @@ class Array(KernelData):
         cl_context = cl_environment.context
 
         if cl_context not in self._buffer_cache:
-            if self._use_host_ptr:
+            use_host_ptr = self._use_host_ptr
+            if use_host_ptr is None:
+                use_host_ptr = cl_environment.has_unified_memory
+            self._host_ptr_cache[cl_context] = use_host_ptr
+
+            if use_host_ptr:
                 self._buffer_cache[cl_context] = cl.Buffer(cl_context,
                                                            get_mem_flags() | cl.mem_flags.USE_HOST_PTR,
                                                            hostbuf=self._data)
             else:
-                self._buffer_cache[cl_context] = cl.Buffer(cl_context, get_mem_flags(), size=self._data.nbytes)
+                self._buffer_cache[cl_context] = cl_environment.allocate(self._data.nbytes)
 
         return [self._buffer_cache[cl_context]]
 
@@ -1147,15 +1165,7 @@ class Zeros(KernelData):
         itemsize = dtype.itemsize
 
         if cl_context not in self._buffer_cache:
-            if self._is_writable:
-                if self._is_readable:
-                    flags = cl.mem_flags.READ_WRITE
-                else:
-                    flags = cl.mem_flags.WRITE_ONLY
-            else:
-                flags = cl.mem_flags.READ_ONLY
-
-            buffer = cl.Buffer(cl_context, flags, size=np.prod(self._shape) * itemsize)
+            buffer = cl_environment.allocate(int(np.prod(self._shape)) * itemsize)
 
             cl.enqueue_fill_buffer(cl_environment.queue, buffer,
                                    np.zeros(1, dtype=dtype), 0, np.prod(self._shape) * itemsize)
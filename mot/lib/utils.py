@@ -5,12 +5,16 @@ import numbers
 import os
 from collections import Iterable, Mapping, OrderedDict
 from contextlib import contextmanager
-from functools import reduce
+from functools import reduce, lru_cache
 import numpy as np
 import pyopencl as cl
 import pyopencl.array as cl_array
 import tatsu
-from pkg_resources import resource_filename
+
+try:
+    from importlib.resources import files as resource_files
+except ImportError:  # Python < 3.9
+    resource_files = None
 
 __author__ = 'Robbert Harms'
 __date__ = "2014-05-13"
@@ -273,9 +277,57 @@ def device_supports_double(cl_device):
     return 'cl_khr_fp64' in dev_extensions
 
 
+@lru_cache(maxsize=None)
+def get_resource_filename(relative_path):
+    """Get the absolute path to a resource file shipped with MOT.
+
+    The lookups are cached, such that the package resources are only resolved and checked once per path. This uses
+    :mod:`importlib.resources` if available and only falls back to the (slow to import) ``pkg_resources`` on older
+    Python versions. Modules shipping CL code files typically resolve these at import time, such that missing
+    files are reported early instead of when a library function is first constructed.
+
+    Args:
+        relative_path (str): the path relative to the MOT package, for example ``data/opencl/complex.h``
+
+    Returns:
+        str: the absolute path to the resource
+
+    Raises:
+        FileNotFoundError: if the resource does not exist
+    """
+    if resource_files is not None:
+        path = os.path.abspath(str(resource_files('mot').joinpath(relative_path)))
+    else:
+        from pkg_resources import resource_filename
+        path = os.path.abspath(resource_filename('mot', relative_path))
+
+    if not os.path.isfile(path):
+        raise FileNotFoundError('The resource file "{}" could not be found.'.format(relative_path))
+    return path
+
+
+@lru_cache(maxsize=None)
+def read_file(file_path):
+    """Read and return the contents of a (CL code) file.
+
+    The contents are cached per file path, such that every file is only read once.
+
+    Args:
+        file_path (str): the path to the file
+
+    Returns:
+        str: the contents of the file
+    """
+    with open(os.path.abspath(file_path), 'r') as f:
+        return f.read()
+
+
+@lru_cache(maxsize=None)
 def get_cl_utility_definitions(double_precision, include_complex=True):
     """Get the model floating point type definition.
 
+    The generated definitions only depend on the arguments and are cached, since they are prepended to every kernel.
+
     Args:
         double_precision (boolean): if True we will use the double type for the mot_float_type type.
             Else, we will use the single precision float type for the mot_float_type type.
@@ -285,8 +337,7 @@ def get_cl_utility_definitions(double_precision, include_complex=True):
         str: defines the mot_float_type types, the epsilon and the MIN and MAX values.
     """
     if include_complex:
-        with open(os.path.abspath(resource_filename('mot', 'data/opencl/complex.h')), 'r') as f:
-            complex_number_support = f.read()
+        complex_number_support = read_file(get_resource_filename('data/opencl/complex.h'))
     else:
         complex_number_support = ''
 
@@ -322,6 +373,40 @@ def get_cl_utility_definitions(double_precision, include_complex=True):
             *batch_range = full_runs + !(local_id / rest);
             return offset + min(local_id, rest);
         }
+
+        /**
+         * Sum the given value over all the workitems in a workgroup.
+         *
+         * This uses a tree reduction in local memory, taking log2(n) steps for a workgroup of size n. Workgroup
+         * sizes which are not a power of two are supported as well. This must be called by all workitems
+         * in the workgroup.
+         *
+         * Args:
+         *  value: the value of the current workitem
+         *  scratch: local memory with room for one double per workitem in the workgroup
+         *
+         * Returns:
+         *  the sum of the values over all workitems, returned to every workitem
+         */
+        double workgroup_reduce_sum(double value, local double* scratch){
+            uint local_id = get_local_id(0);
+
+            scratch[local_id] = value;
+            barrier(CLK_LOCAL_MEM_FENCE);
+
+            uint stride;
+            for(uint size = get_local_size(0); size > 1; size = stride){
+                stride = (size + 1) / 2;
+                if(local_id + stride < size){
+                    scratch[local_id] += scratch[local_id + stride];
+                }
+                barrier(CLK_LOCAL_MEM_FENCE);
+            }
+
+            double sum = scratch[0];
+            barrier(CLK_LOCAL_MEM_FENCE);
+            return sum;
+        }
     '''
 
     if double_precision:
@@ -645,6 +730,50 @@ def multiprocess_mapping(func, iterable):
         return list(map(func, iterable))
 
 
+class LRUCache:
+
+    def __init__(self, maxsize):
+        """A dictionary like cache which only keeps the most recently used items.
+
+        This is meant for caching the objects generated for a key, for which ``functools.lru_cache`` can not be used,
+        for example because the key differs from the function arguments.
+
+        Args:
+            maxsize (int): the maximum number of items to keep, if full, the least recently used item is evicted.
+        """
+        self._maxsize = maxsize
+        self._items = OrderedDict()
+
+    def get(self, key, default=None):
+        """Get the item stored under the given key, marking it as most recently used.
+
+        Args:
+            key (Hashable): the key of the item
+            default: the value to return if the key is not in the cache
+
+        Returns:
+            the cached item, or the default value if not present
+        """
+        try:
+            value = self._items[key]
+        except KeyError:
+            return default
+        self._items.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        if len(self._items) > self._maxsize:
+            self._items.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+
 _tatsu_cl_function = '''
     function = {documentation}* [kernel] [address_space] data_type function_name arglist body;
     documentation = '/*' ->'*/';
@@ -735,6 +864,18 @@ def split_cl_function(cl_str):
     Returns:
         tuple: string elements for the return type, function name, parameter list and the body
     """
+    is_kernel_func, return_type, function_name, parameter_list, body = _split_cl_function(cl_str)
+    return is_kernel_func, return_type, function_name, list(parameter_list), body
+
+
+@lru_cache(maxsize=256)
+def _split_cl_function(cl_str):
+    """Parses the CL function for :func:`split_cl_function`.
+
+    Library functions and CL function templates are constructed from the same source strings over and over again.
+    Since parsing is relatively expensive, the result is memoized per source string. The parameter list is returned
+    as a tuple such that the cached results can not be modified.
+    """
     class Semantics:
 
         def __init__(self):
@@ -745,7 +886,8 @@ def split_cl_function(cl_str):
             self._cl_body = ''
 
         def result(self, ast):
-            return self._is_kernel_func, self._return_type, self._function_name, self._parameter_list, self._cl_body
+            return (self._is_kernel_func, self._return_type, self._function_name, tuple(self._parameter_list),
+                    self._cl_body)
 
         def kernel(self, ast):
             self._is_kernel_func = True
@@ -1,8 +1,6 @@
-import os
-
 from mot.lib.cl_function import SimpleCLCodeObject
-from mot.library_functions.base import SimpleCLLibrary, SimpleCLLibraryFromFile, CLLibrary
-from pkg_resources import resource_filename
+from mot.library_functions.base import SimpleCLLibrary, SimpleCLLibraryFromFile, CLLibrary, SharedInstance
+from mot.lib.utils import get_resource_filename, read_file
 
 from mot.library_functions.eispack import eispack_tred2, eispack_tql2
 from mot.library_functions.unity import log1pmx
@@ -12,7 +10,7 @@ from mot.library_functions.continuous_distributions.gamma import gamma_pdf, gamm
     gamma_cdf_approx, gamma_ppf_approx
 from mot.library_functions.continuous_distributions.invgamma import invgamma_pdf, invgamma_logpdf, \
     invgamma_cdf, invgamma_ppf
-from mot.library_functions.error_functions import dawson, CerfImWOfX, erfi
+from mot.library_functions.error_functions import dawson, CerfImWOfX, CerfImWOfXFast, erfi
 from mot.library_functions.legendre_polynomial import FirstLegendreTerm, LegendreTerms, \
     EvenLegendreTerms, OddLegendreTerms
 from mot.library_functions.special_functions import bessi0, bessi1, log_bessi0, bessi, bessiaplusn, \
@@ -26,6 +24,11 @@ __email__ = 'robbert@xkls.nl'
 __licence__ = 'LGPL v3'
 
 
+_cl_code_files = {name: get_resource_filename('data/opencl/{}'.format(name))
+                  for name in ['euclidian_norm.cl', 'random123/openclfeatures.h', 'random123/array.h',
+                               'random123/philox.h', 'random123/rand123.h']}
+
+
 class LogCosh(SimpleCLLibrary):
     def __init__(self):
         """Computes :math:`log(cosh(x))`
@@ -44,21 +47,20 @@ class LogCosh(SimpleCLLibrary):
         ''')
 
 
-class Rand123(SimpleCLCodeObject):
+class Rand123(SimpleCLCodeObject, metaclass=SharedInstance):
     def __init__(self):
         generator = 'philox'
 
-        src = open(os.path.abspath(resource_filename('mot', 'data/opencl/random123/openclfeatures.h'), ), 'r').read()
-        src += open(os.path.abspath(resource_filename('mot', 'data/opencl/random123/array.h'), ), 'r').read()
-        src += open(os.path.abspath(resource_filename('mot', 'data/opencl/random123/{}.h'.format(generator)), ),
-                    'r').read()
-        src += (open(os.path.abspath(resource_filename('mot', 'data/opencl/random123/rand123.h'), ), 'r').read() % {
+        src = read_file(_cl_code_files['random123/openclfeatures.h'])
+        src += read_file(_cl_code_files['random123/array.h'])
+        src += read_file(_cl_code_files['random123/{}.h'.format(generator)])
+        src += read_file(_cl_code_files['random123/rand123.h']) % {
             'GENERATOR_NAME': (generator)
-        })
+        }
         super().__init__(src)
 
 
-class EuclidianNormFunction(SimpleCLLibraryFromFile):
+class EuclidianNormFunction(SimpleCLLibraryFromFile, metaclass=SharedInstance):
     def __init__(self, memspace='private', memtype='mot_float_type'):
         """A CL functions for calculating the Euclidian distance between n values.
 
@@ -66,12 +68,113 @@ class EuclidianNormFunction(SimpleCLLibraryFromFile):
             memspace (str): The memory space of the memtyped array (private, constant, global).
             memtype (str): the memory type to use, double, float, mot_float_type, ...
         """
+        function_name = self.__class__.__name__ + '_' + memspace + '_' + memtype
         super().__init__(
             memtype,
-            self.__class__.__name__ + '_' + memspace + '_' + memtype,
-            [],
-            resource_filename('mot', 'data/opencl/euclidian_norm.cl'),
-            var_replace_dict={'MEMSPACE': memspace, 'MEMTYPE': memtype})
+            function_name,
+            ['{} const {}* const x'.format(memspace, memtype), 'const int n'],
+            _cl_code_files['euclidian_norm.cl'],
+            var_replace_dict={'FUNCTION_NAME': function_name, 'MEMSPACE': memspace, 'MEMTYPE': memtype,
+                              'VECTORIZED': int(memspace in ('global', 'constant'))})
+
+
+class PairwiseSummation(SimpleCLLibrary):
+    def __init__(self, memspace='private', memtype='mot_float_type'):
+        """Sum the values of an array using pairwise summation.
+
+        The array is summed in blocks of eight elements, which are combined pairwise afterwards. This has a worst case
+        error growth of O(eps log n), while, unlike Kahan summation, there is no loop carried
+        dependency between the additions. The generated function is named
+        ``pairwise_summation_<memspace>_<memtype>`` and has the signature:
+
+        .. code-block:: c
+
+            double pairwise_summation_<memspace>_<memtype>(<memspace> const <memtype>* const x, const uint n);
+
+        Args:
+            memspace (str): The memory space of the memtyped array (private, constant, global).
+            memtype (str): the memory type to use, double, float, mot_float_type, ...
+        """
+        super().__init__('''
+            double pairwise_summation_{memspace}_{memtype}({memspace} const {memtype}* const x, const uint n){{
+                // a stack of partial sums, the i-th element summing blocks of 8 * 2^i values
+                double partial_sums[32];
+                uint depth = 0;
+                uint block_ind = 0;
+                uint i;
+                double sum;
+
+                for(i = 0; i + 8 <= n; i += 8){{
+                    sum = ((x[i] + x[i + 1]) + (x[i + 2] + x[i + 3])) + ((x[i + 4] + x[i + 5]) + (x[i + 6] + x[i + 7]));
+
+                    // merge the partial sums of equal size, like carrying in a binary counter
+                    block_ind++;
+                    for(uint k = block_ind; !(k & 1); k >>= 1){{
+                        sum = partial_sums[--depth] + sum;
+                    }}
+                    partial_sums[depth++] = sum;
+                }}
+
+                sum = 0;
+                for(; i < n; i++){{
+                    sum += x[i];
+                }}
+                while(depth > 0){{
+                    sum = partial_sums[--depth] + sum;
+                }}
+                return sum;
+            }}
+        '''.format(memspace=memspace, memtype=memtype))
+
+
+class InterleavedKahanSummation(SimpleCLLibrary):
+    def __init__(self, memspace='private', memtype='mot_float_type'):
+        """Sum the values of an array using eight interleaved Kahan summations.
+
+        Each of the eight lanes of a vector keeps its own compensated sum, which are combined at the end. This keeps
+        the O(eps) error bound of Kahan summation while allowing the additions to be vectorized.
+        The generated function is named ``interleaved_kahan_summation_<memspace>_<memtype>`` and has the signature:
+
+        .. code-block:: c
+
+            double interleaved_kahan_summation_<memspace>_<memtype>(<memspace> const <memtype>* const x,
+                                                                   const uint n);
+
+        Args:
+            memspace (str): The memory space of the memtyped array (private, constant, global).
+            memtype (str): the memory type to use, double, float, mot_float_type, ...
+        """
+        super().__init__('''
+            double interleaved_kahan_summation_{memspace}_{memtype}({memspace} const {memtype}* const x,
+                                                                   const uint n){{
+                double8 sums = (double8)(0);
+                double8 compensations = (double8)(0);
+                double8 y8, t8;
+                uint i;
+
+                for(i = 0; i + 8 <= n; i += 8){{
+                    y8 = convert_double8(vload8(0, x + i)) - compensations;
+                    t8 = sums + y8;
+                    compensations = (t8 - sums) - y8;
+                    sums = t8;
+                }}
+
+                double lane_sums[16] = {{sums.s0, sums.s1, sums.s2, sums.s3, sums.s4, sums.s5, sums.s6, sums.s7,
+                                        -compensations.s0, -compensations.s1, -compensations.s2, -compensations.s3,
+                                        -compensations.s4, -compensations.s5, -compensations.s6, -compensations.s7}};
+
+                double sum = 0;
+                double compensation = 0;
+                double y, t;
+                for(uint k = 0; k < 16 + n - i; k++){{
+                    y = (k < 16 ? lane_sums[k] : x[i + k - 16]) - compensation;
+                    t = sum + y;
+                    compensation = (t - sum) - y;
+                    sum = t;
+                }}
+                return sum;
+            }}
+        '''.format(memspace=memspace, memtype=memtype))
 
 
 class simpsons_rule(SimpleCLLibrary):
@@ -1,7 +1,6 @@
-import os
 from textwrap import indent, dedent
 from mot.lib.cl_function import CLFunction, SimpleCLFunction
-from mot.lib.utils import split_cl_function
+from mot.lib.utils import split_cl_function, read_file, LRUCache
 
 __author__ = 'Robbert Harms'
 __date__ = "2016-10-03"
@@ -13,6 +12,31 @@ class CLLibrary(CLFunction):
     pass
 
 
+class SharedInstance(type):
+    """Metaclass sharing a single instance of a class per set of constructor arguments.
+
+    Most library functions are immutable and fully determined by their constructor arguments. Using this metaclass,
+    constructing such a library function twice with the same arguments returns the same object. Like
+    ``functools.lru_cache(typed=True)``, arguments of different types are cached separately and only the
+    most recently used instances are kept. If the arguments are not hashable, a new instance is constructed.
+    """
+    _instances = LRUCache(256)
+
+    def __call__(cls, *args, **kwargs):
+        kwargs_items = tuple(sorted(kwargs.items()))
+        key = (cls, args, tuple(type(arg) for arg in args), kwargs_items,
+               tuple(type(value) for _, value in kwargs_items))
+        try:
+            instance = SharedInstance._instances.get(key)
+        except TypeError:
+            return super().__call__(*args, **kwargs)
+
+        if instance is None:
+            instance = super().__call__(*args, **kwargs)
+            SharedInstance._instances[key] = instance
+        return instance
+
+
 class SimpleCLLibrary(CLLibrary, SimpleCLFunction):
 
     def __init__(self, cl_code, **kwargs):
@@ -43,8 +67,7 @@ class SimpleCLLibraryFromFile(CLLibrary, SimpleCLFunction):
         """
         self._var_replace_dict = var_replace_dict
 
-        with open(os.path.abspath(cl_code_file), 'r') as f:
-            code = f.read()
+        code = read_file(cl_code_file)
 
         if var_replace_dict is not None:
             code = code % var_replace_dict
@@ -52,13 +75,14 @@ class SimpleCLLibraryFromFile(CLLibrary, SimpleCLFunction):
         super().__init__(return_type, cl_function_name, parameter_list, code, **kwargs)
         self._code = code
 
-    def get_cl_code(self):
-        return dedent('''
-            {dependencies}
+        # the code of this function does not change, only the dependencies are added when requesting the CL code
+        self._guarded_code = dedent('''
             #ifndef {inclusion_guard_name}
             #define {inclusion_guard_name}
             {code}
             #endif // {inclusion_guard_name}
-        '''.format(dependencies=indent(self._get_cl_dependency_code(), ' ' * 4 * 3),
-                   inclusion_guard_name='INCLUDE_GUARD_{}'.format(self.get_cl_function_name()),
+        '''.format(inclusion_guard_name='INCLUDE_GUARD_{}'.format(self.get_cl_function_name()),
                    code=indent('\n' + self._code.strip() + '\n', ' ' * 4 * 3)))
+
+    def _get_cl_code_without_dependencies(self):
+        return self._guarded_code
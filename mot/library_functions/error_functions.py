@@ -1,5 +1,6 @@
-from pkg_resources import resource_filename
+from mot.lib.utils import get_resource_filename
 from mot.library_functions import SimpleCLLibraryFromFile, SimpleCLLibrary
+from mot.library_functions.base import SharedInstance
 
 __author__ = 'Robbert Harms'
 __date__ = '2018-05-12'
@@ -8,26 +9,61 @@ __email__ = 'robbert@xkls.nl'
 __licence__ = 'LGPL v3'
 
 
-class CerfImWOfX(SimpleCLLibraryFromFile):
+_cl_code_files = {name: get_resource_filename('data/opencl/cerf/{}.cl'.format(name))
+                  for name in ['im_w_of_x', 'im_w_of_x_fast']}
+
+
+class CerfImWOfX(SimpleCLLibraryFromFile, metaclass=SharedInstance):
     def __init__(self):
         """Calculate the cerf."""
         super().__init__(
             'void', 'cerf', [],
-            resource_filename('mot', 'data/opencl/cerf/im_w_of_x.cl'))
+            _cl_code_files['im_w_of_x'])
 
 
-class dawson(SimpleCLLibrary):
+class CerfImWOfXFast(SimpleCLLibraryFromFile, metaclass=SharedInstance):
     def __init__(self):
-        super().__init__('double dawson(double x){ return (sqrt(M_PI)/2.0) * im_w_of_x(x); }',
-                         dependencies=[CerfImWOfX()])
+        """Fast approximation of the cerf, using a single rational function instead of a piecewise evaluation.
+
+        This defines the function ``im_w_of_x_fast``, with a relative error below 3e-7.
+        """
+        super().__init__(
+            'double', 'im_w_of_x_fast', [],
+            _cl_code_files['im_w_of_x_fast'])
 
 
-class erfi(SimpleCLLibrary):
-    def __init__(self):
+class dawson(SimpleCLLibrary, metaclass=SharedInstance):
+    def __init__(self, fast=False):
+        """Calculate Dawson's integral.
+
+        Args:
+            fast (boolean): if set, we use a fast rational approximation with a relative error below 3e-7.
+                The CL function is then named ``dawson_fast`` instead of ``dawson``.
+        """
+        if fast:
+            super().__init__('double dawson_fast(double x){ return (sqrt(M_PI)/2.0) * im_w_of_x_fast(x); }',
+                             dependencies=[CerfImWOfXFast()])
+        else:
+            super().__init__('double dawson(double x){ return (sqrt(M_PI)/2.0) * im_w_of_x(x); }',
+                             dependencies=[CerfImWOfX()])
+
+
+class erfi(SimpleCLLibrary, metaclass=SharedInstance):
+    def __init__(self, fast=False):
         """Calculate the imaginary error function for a real argument (special case).
 
         Compute erfi(x) = -i erf(ix), the imaginary error function.
+
+        Args:
+            fast (boolean): if set, we use a fast rational approximation with a relative error below 3e-7.
+                The CL function is then named ``erfi_fast`` instead of ``erfi``.
         """
-        super().__init__(
-            'double erfi(double x){ return x*x > 720 ? (x > 0 ? INFINITY : -INFINITY) : exp(x*x) * im_w_of_x(x); }',
-            dependencies=[CerfImWOfX()])
+        if fast:
+            super().__init__(
+                'double erfi_fast(double x){ '
+                'return x*x > 720 ? (x > 0 ? INFINITY : -INFINITY) : exp(x*x) * im_w_of_x_fast(x); }',
+                dependencies=[CerfImWOfXFast()])
+        else:
+            super().__init__(
+                'double erfi(double x){ return x*x > 720 ? (x > 0 ? INFINITY : -INFINITY) : exp(x*x) * im_w_of_x(x); }',
+                dependencies=[CerfImWOfX()])
@@ -1,4 +1,5 @@
 from mot.library_functions import SimpleCLLibrary
+from mot.library_functions.base import SharedInstance
 
 __author__ = 'Robbert Harms'
 __date__ = '2018-09-12'
@@ -7,7 +8,7 @@ __email__ = 'robbert@xkls.nl'
 __licence__ = 'LGPL v3'
 
 
-class FirstLegendreTerm(SimpleCLLibrary):
+class FirstLegendreTerm(SimpleCLLibrary, metaclass=SharedInstance):
     def __init__(self):
         """Compute the first term of the legendre polynomial for the given value x and the polynomial degree n.
 
@@ -27,6 +28,8 @@ class FirstLegendreTerm(SimpleCLLibrary):
             (k+1) P[k+1](x) = (2k+1)x P[k](x) - k P[k-1](x), k = 1,...,n-1
             P[0](x) = 1, P[1](x) = x.
 
+        For the low degrees, n <= 8, the recursion is skipped and the explicit polynomial is evaluated instead,
+        using Horner's scheme in x^2.
 
         The function arguments are:
 
@@ -48,11 +51,18 @@ class FirstLegendreTerm(SimpleCLLibrary):
                     return -1.0;
                 }
 
-                if (n == 0){
-                    return 1.0;
-                }
-                if (n == 1){
-                    return x;
+                const double x2 = x * x;
+                switch(n){
+                    case 0: return 1.0;
+                    case 1: return x;
+                    case 2: return fma(1.5, x2, -0.5);
+                    case 3: return x * fma(2.5, x2, -1.5);
+                    case 4: return fma(fma(4.375, x2, -3.75), x2, 0.375);
+                    case 5: return x * fma(fma(7.875, x2, -8.75), x2, 1.875);
+                    case 6: return fma(fma(fma(14.4375, x2, -19.6875), x2, 6.5625), x2, -0.3125);
+                    case 7: return x * fma(fma(fma(26.8125, x2, -43.3125), x2, 19.6875), x2, -2.1875);
+                    case 8: return fma(fma(fma(fma(50.2734375, x2, -93.84375), x2, 54.140625), x2, -9.84375),
+                                       x2, 0.2734375);
                 }
 
                 double P0 = 1.0;
@@ -70,7 +80,7 @@ class FirstLegendreTerm(SimpleCLLibrary):
         ''')
 
 
-class LegendreTerms(SimpleCLLibrary):
+class LegendreTerms(SimpleCLLibrary, metaclass=SharedInstance):
     def __init__(self):
         """Compute a range of Legendre terms for the given value x and the polynomial degree n.
 
@@ -137,7 +147,7 @@ class LegendreTerms(SimpleCLLibrary):
         ''')
 
 
-class EvenLegendreTerms(SimpleCLLibrary):
+class EvenLegendreTerms(SimpleCLLibrary, metaclass=SharedInstance):
     def __init__(self):
         """Compute a range of even legendre terms for the given value x and the polynomial degree n.
 
@@ -204,7 +214,7 @@ class EvenLegendreTerms(SimpleCLLibrary):
         ''')
 
 
-class OddLegendreTerms(SimpleCLLibrary):
+class OddLegendreTerms(SimpleCLLibrary, metaclass=SharedInstance):
     def __init__(self):
         """Compute a range of odd legendre terms for the given value x and the polynomial degree n.
 
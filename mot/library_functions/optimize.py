@@ -5,7 +5,7 @@ All routines are prefixed with 'eispack_' for use in MOT.
 Reference:
     https://people.sc.fsu.edu/~jburkardt/c_src/eispack/eispack.html .
 """
-from pkg_resources import resource_filename
+from mot.lib.utils import get_resource_filename
 
 from mot.lib.kernel_data import LocalMemory
 from mot.library_functions import SimpleCLLibrary, SimpleCLLibraryFromFile
@@ -17,6 +17,13 @@ __email__ = 'robbert@xkls.nl'
 __licence__ = 'LGPL v3'
 
 
+_max_unrolled_parameters = 12
+"""Up to this number of parameters, the loops over the parameters in the optimization routines are fully unrolled."""
+
+_cl_code_files = {name: get_resource_filename('data/opencl/{}.cl'.format(name))
+                  for name in ['bracket_spf', 'nmsimplex_spf', 'powell', 'subplex', 'lmmin']}
+
+
 class bracket_spf(SimpleCLLibraryFromFile):
 
     def __init__(self, function_name):
@@ -38,7 +45,7 @@ class bracket_spf(SimpleCLLibraryFromFile):
 
         super().__init__(
             'int', 'bracket' + params['SPF_NAME'], [],
-            resource_filename('mot', 'data/opencl/bracket_spf.cl'),
+            _cl_code_files['bracket_spf'],
             var_replace_dict=params)
 
 
@@ -63,7 +70,7 @@ class nmsimplex_spf(SimpleCLLibraryFromFile):
 
         super().__init__(
             'int', 'nmsimplex' + params['SPF_NAME'], [],
-            resource_filename('mot', 'data/opencl/nmsimplex_spf.cl'),
+            _cl_code_files['nmsimplex_spf'],
             var_replace_dict=params)
 
 
@@ -92,6 +99,7 @@ class Powell(SimpleCLLibraryFromFile):
         params = {
             'FUNCTION_NAME': eval_func.get_cl_function_name(),
             'NMR_PARAMS': nmr_parameters,
+            'UNROLL_PARAMS': '#pragma unroll' if nmr_parameters <= _max_unrolled_parameters else '',
             'RESET_METHOD': reset_method.upper(),
             'PATIENCE': patience,
             'PATIENCE_LINE_SEARCH': patience if patience_line_search is None else patience_line_search,
@@ -104,7 +112,7 @@ class Powell(SimpleCLLibraryFromFile):
                 'void* data',
                 'local mot_float_type* scratch_mot_float_type'
             ],
-            resource_filename('mot', 'data/opencl/powell.cl'),
+            _cl_code_files['powell'],
             var_replace_dict=params, **kwargs)
 
     def get_kernel_data(self):
@@ -220,7 +228,7 @@ class Subplex(SimpleCLLibraryFromFile):
                 'local mot_float_type* subplex_scratch_float',
                 'local int* subplex_scratch_int'
             ],
-            resource_filename('mot', 'data/opencl/subplex.cl'), var_replace_dict=params, **kwargs)
+            _cl_code_files['subplex'], var_replace_dict=params, **kwargs)
 
     def get_kernel_data(self):
         """Get the kernel data needed for this optimization routine to work."""
@@ -263,6 +271,7 @@ class LevenbergMarquardt(SimpleCLLibraryFromFile):
             'FUNCTION_NAME': eval_func.get_cl_function_name(),
             'JACOBIAN_FUNCTION_NAME': jacobian_func.get_cl_function_name(),
             'NMR_PARAMS': nmr_parameters,
+            'UNROLL_PARAMS': '#pragma unroll' if nmr_parameters <= _max_unrolled_parameters else '',
             'PATIENCE': patience,
             'NMR_OBSERVATIONS': nmr_observations,
             'SCALE_DIAG': int(bool(scale_diag)),
@@ -275,7 +284,7 @@ class LevenbergMarquardt(SimpleCLLibraryFromFile):
                              'void* data',
                              'mot_float_type* scratch_mot_float_type',
                              'int* scratch_int'],
-            resource_filename('mot', 'data/opencl/lmmin.cl'),
+            _cl_code_files['lmmin'],
             var_replace_dict=var_replace_dict, **kwargs)
 
     def get_kernel_data(self):
@@ -75,11 +75,11 @@ class real_zeros_cubic_pol(SimpleCLLibrary):
                     const double j = pow(i, (double)(1/3.0));
                     const double k = acos(-(g / (2 * i)));
                     const double L = -j;
-                    const double M = cos(k / 3.0);
-                    const double N = sqrt(3.0) * sin(k / 3.0);
+                    double M;
+                    const double N = sqrt(3.0) * sincos(k / 3.0, &M);
                     const double P = -(b / (3.0 * a));
 
-                    roots[0] = 2 * j * cos(k / 3.0) - (b / (3.0 * a));
+                    roots[0] = 2 * j * M + P;
                     roots[1] = L * (M + N) + P;
                     roots[2] = L * (M - N) + P;
 
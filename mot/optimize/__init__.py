@@ -261,16 +261,18 @@ def _minimize_powell(func, x0, cl_runtime_info, lower_bounds, upper_bounds, use_
 
     eval_func = SimpleCLFunction.from_string('''
         double evaluate(local mot_float_type* x, void* data){
+            _powell_eval_func_data* eval_data = (_powell_eval_func_data*)data;
+
             double penalty = _mle_penalty(
                 x,
-                ((_powell_eval_func_data*)data)->data,
-                ((_powell_eval_func_data*)data)->lower_bounds,
-                ((_powell_eval_func_data*)data)->upper_bounds,
+                eval_data->data,
+                eval_data->lower_bounds,
+                eval_data->upper_bounds,
                 ''' + str(options.get('penalty_weight', 1e30)) + ''',
-                ((_powell_eval_func_data*)data)->penalty_data
+                eval_data->penalty_data
             );
 
-            double func_val = ''' + func.get_cl_function_name() + '''(x, ((_powell_eval_func_data*)data)->data, 0);
+            double func_val = ''' + func.get_cl_function_name() + '''(x, eval_data->data, 0);
 
             if(isnan(func_val)){
                 return INFINITY;
@@ -345,16 +347,18 @@ def _minimize_nmsimplex(func, x0, cl_runtime_info, lower_bounds, upper_bounds, u
 
     eval_func = SimpleCLFunction.from_string('''
         double evaluate(local mot_float_type* x, void* data){
+            _nmsimplex_eval_func_data* eval_data = (_nmsimplex_eval_func_data*)data;
+
             double penalty = _mle_penalty(
                 x,
-                ((_nmsimplex_eval_func_data*)data)->data,
-                ((_nmsimplex_eval_func_data*)data)->lower_bounds,
-                ((_nmsimplex_eval_func_data*)data)->upper_bounds,
+                eval_data->data,
+                eval_data->lower_bounds,
+                eval_data->upper_bounds,
                 ''' + str(options.get('penalty_weight', 1e30)) + ''',
-                ((_nmsimplex_eval_func_data*)data)->penalty_data
+                eval_data->penalty_data
             );
 
-            double func_val = ''' + func.get_cl_function_name() + '''(x, ((_nmsimplex_eval_func_data*)data)->data, 0);
+            double func_val = ''' + func.get_cl_function_name() + '''(x, eval_data->data, 0);
 
             if(isnan(func_val)){
                 return INFINITY;
@@ -440,16 +444,18 @@ def _minimize_subplex(func, x0, cl_runtime_info, lower_bounds, upper_bounds, use
 
     eval_func = SimpleCLFunction.from_string('''
         double evaluate(local mot_float_type* x, void* data){
+            _subplex_eval_func_data* eval_data = (_subplex_eval_func_data*)data;
+
             double penalty = _mle_penalty(
                 x,
-                ((_subplex_eval_func_data*)data)->data,
-                ((_subplex_eval_func_data*)data)->lower_bounds,
-                ((_subplex_eval_func_data*)data)->upper_bounds,
+                eval_data->data,
+                eval_data->lower_bounds,
+                eval_data->upper_bounds,
                 ''' + str(options.get('penalty_weight', 1e30)) + ''',
-                ((_subplex_eval_func_data*)data)->penalty_data
+                eval_data->penalty_data
             );
 
-            double func_val = ''' + func.get_cl_function_name() + '''(x, ((_subplex_eval_func_data*)data)->data, 0);
+            double func_val = ''' + func.get_cl_function_name() + '''(x, eval_data->data, 0);
 
             if(isnan(func_val)){
                 return INFINITY;
@@ -491,18 +497,21 @@ def _minimize_levenberg_marquardt(func, x0, nmr_observations, cl_runtime_info, l
 
     eval_func = SimpleCLFunction.from_string('''
         void evaluate(local mot_float_type* x, void* data, local mot_float_type* result){
+            _lm_eval_func_data* eval_data = (_lm_eval_func_data*)data;
+
             double penalty = _mle_penalty(
                 x,
-                ((_lm_eval_func_data*)data)->data,
-                ((_lm_eval_func_data*)data)->lower_bounds,
-                ((_lm_eval_func_data*)data)->upper_bounds,
+                eval_data->data,
+                eval_data->lower_bounds,
+                eval_data->upper_bounds,
                 ''' + str(options.get('penalty_weight', 1e30)) + ''',
-                ((_lm_eval_func_data*)data)->penalty_data
+                eval_data->penalty_data
             );
 
-            ''' + func.get_cl_function_name() + '''(x, ((_lm_eval_func_data*)data)->data, result);
+            ''' + func.get_cl_function_name() + '''(x, eval_data->data, result);
 
-            if(get_local_id(0) == 0){
+            // inside the bounds and constraints the penalty is zero, skip the extra pass over the observations
+            if(get_local_id(0) == 0 && penalty != 0){
                 for(int j = 0; j < ''' + str(nmr_observations) + '''; j++){
                     result[j] += penalty;
                 }
@@ -569,9 +578,10 @@ def _lm_numdiff_jacobian(eval_func, nmr_params, nmr_observations):
             const uint nmr_params = ''' + str(nmr_params) + ''';
             const uint nmr_observations = ''' + str(nmr_observations) + ''';
 
-            local mot_float_type* lower_bounds = ((_lm_eval_func_data*)data)->lower_bounds;
-            local mot_float_type* upper_bounds = ((_lm_eval_func_data*)data)->upper_bounds;
-            local mot_float_type* jacobian_x_tmp = ((_lm_eval_func_data*)data)->jacobian_x_tmp;
+            _lm_eval_func_data* eval_data = (_lm_eval_func_data*)data;
+            local mot_float_type* lower_bounds = eval_data->lower_bounds;
+            local mot_float_type* upper_bounds = eval_data->upper_bounds;
+            local mot_float_type* jacobian_x_tmp = eval_data->jacobian_x_tmp;
 
             mot_float_type step_size = 30 * MOT_EPSILON;
 
@@ -61,9 +61,18 @@ def uniform(nmr_distributions, nmr_samples, low=0, high=1, ctype='float', seed=N
             rand123_data rand123_rng_data = rand123_initialize_from_seed(rng_seed);
             void* rng_data = (void*)&rand123_rng_data;
 
-            for(uint i = 0; i < ''' + str(nmr_samples) + '''; i++){
-                double4 randomnr = rand4(rng_data);
-                samples[i] = (''' + ctype + ''')(low + randomnr.x * (high - low));
+            const uint nmr_samples = ''' + str(nmr_samples) + ''';
+            double4 randomnr;
+            uint i;
+
+            // every call to the generator gives four random numbers, all of which are used
+            for(i = 0; i + 4 <= nmr_samples; i += 4){
+                randomnr = low + rand4(rng_data) * (high - low);
+                ''' + _store_samples4(ctype) + '''
+            }
+            if(i < nmr_samples){
+                randomnr = low + rand4(rng_data) * (high - low);
+                ''' + _store_remainder_samples(ctype) + '''
             }
         }
     ''', dependencies=[Rand123()])
@@ -98,9 +107,18 @@ def normal(nmr_distributions, nmr_samples, mean=0, std=1, ctype='float', seed=No
             rand123_data rand123_rng_data = rand123_initialize_from_seed(rng_seed);
             void* rng_data = (void*)&rand123_rng_data;
 
-            for(uint i = 0; i < ''' + str(nmr_samples) + '''; i++){
-                double4 randomnr = randn4(rng_data);
-                samples[i] = (''' + ctype + ''')(mean + randomnr.x * std);
+            const uint nmr_samples = ''' + str(nmr_samples) + ''';
+            double4 randomnr;
+            uint i;
+
+            // every call to the generator gives four random numbers, all of which are used
+            for(i = 0; i + 4 <= nmr_samples; i += 4){
+                randomnr = mean + randn4(rng_data) * std;
+                ''' + _store_samples4(ctype) + '''
+            }
+            if(i < nmr_samples){
+                randomnr = mean + randn4(rng_data) * std;
+                ''' + _store_remainder_samples(ctype) + '''
             }
         }
     ''', dependencies=[Rand123()])
@@ -118,3 +136,41 @@ def _generate_samples(cl_function, nmr_distributions, nmr_samples, ctype, kernel
 
     cl_function.evaluate(kernel_data, nmr_distributions)
     return kernel_data['samples'].get_data()
+
+
+def _store_samples4(ctype):
+    """Get the CL code storing the four samples in the vector ``randomnr`` at positions ``i`` to ``i + 3``.
+
+    This converts the elements one by one, since the ``convert_<type>4`` functions only exist for the builtin types
+    and not for typedefs like ``mot_float_type``.
+
+    Args:
+        ctype (str): the C type of the output samples
+
+    Returns:
+        str: CL code storing the four elements of ``randomnr``
+    """
+    return '''
+        vstore4((''' + ctype + '''4)((''' + ctype + ''')randomnr.x, (''' + ctype + ''')randomnr.y,
+                                     (''' + ctype + ''')randomnr.z, (''' + ctype + ''')randomnr.w), 0, samples + i);
+    '''
+
+
+def _store_remainder_samples(ctype):
+    """Get the CL code storing the last (less than four) samples from the vector ``randomnr``.
+
+    Args:
+        ctype (str): the C type of the output samples
+
+    Returns:
+        str: CL code storing the elements of ``randomnr`` at positions ``i`` and beyond
+    """
+    return '''
+        samples[i] = (''' + ctype + ''')randomnr.x;
+        if(i + 1 < nmr_samples){
+            samples[i + 1] = (''' + ctype + ''')randomnr.y;
+        }
+        if(i + 2 < nmr_samples){
+            samples[i + 2] = (''' + ctype + ''')randomnr.z;
+        }
+    '''
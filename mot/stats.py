@@ -5,7 +5,7 @@ from scipy.stats import norm
 import scipy.integrate
 
 from mot.lib.cl_function import SimpleCLFunction
-from mot.lib.kernel_data import Array, Zeros, Scalar
+from mot.lib.kernel_data import Array, Zeros, Scalar, LocalMemory
 from mot.lib.utils import is_scalar, multiprocess_mapping
 
 __author__ = 'Robbert Harms'
@@ -37,39 +37,69 @@ def fit_circular_gaussian(samples, high=np.pi, low=0):
         high (float): The maximum wrap point
         low (float): The minimum wrap point
     """
-    cl_func = SimpleCLFunction.from_string('''
+    def get_cl_function(nmr_samples):
+        return SimpleCLFunction.from_string('''
         void compute(global mot_float_type* samples,
                      global mot_float_type* means,
                      global mot_float_type* stds,
-                     int nmr_samples,
-                     int low,
-                     int high){
+                     double low,
+                     double high,
+                     local double* scratch){
+
+            const uint nmr_samples = ''' + str(nmr_samples) + ''';
+            uint local_id = get_local_id(0);
+            double scale = 2 * M_PI / (high - low);
+
+            // every workitem sums a batch of the blocks of four samples
+            double4 cos_sum4 = (double4)(0);
+            double4 sin_sum4 = (double4)(0);
+            double4 ang4;
+            double4 cos4;
+
+            uint nmr_blocks = nmr_samples / 4;
+            uint batch_range;
+            uint offset = get_workitem_batch(nmr_blocks, &batch_range);
+
+            for(uint i = offset; i < offset + batch_range; i++){
+                ang4 = (convert_double4(vload4(i, samples)) - low) * scale;
+                sin_sum4 += sincos(ang4, &cos4);
+                cos_sum4 += cos4;
+            }
 
-            double cos_mean = 0;
-            double sin_mean = 0;
+            double cos_sum = (cos_sum4.s0 + cos_sum4.s1) + (cos_sum4.s2 + cos_sum4.s3);
+            double sin_sum = (sin_sum4.s0 + sin_sum4.s1) + (sin_sum4.s2 + sin_sum4.s3);
             double ang;
+            double cos_ang;
+
+            // remaining samples
+            if(local_id == 0){
+                for(uint i = nmr_blocks * 4; i < nmr_samples; i++){
+                    ang = (samples[i] - low) * scale;
+                    sin_sum += sincos(ang, &cos_ang);
+                    cos_sum += cos_ang;
+                }
+            }
 
-            for(uint i = 0; i < nmr_samples; i++){
-                ang = (samples[i] - low)*2*M_PI / (high - low);
+            cos_sum = workgroup_reduce_sum(cos_sum, scratch);
+            sin_sum = workgroup_reduce_sum(sin_sum, scratch);
 
-                cos_mean += (cos(ang) - cos_mean) / (i + 1);
-                sin_mean += (sin(ang) - sin_mean) / (i + 1);
-            }
+            if(local_id == 0){
+                double cos_mean = cos_sum / nmr_samples;
+                double sin_mean = sin_sum / nmr_samples;
 
-            double R = hypot(cos_mean, sin_mean);
-            if(R > 1){
-                R = 1;
-            }
+                double R = hypot(cos_mean, sin_mean);
+                if(R > 1){
+                    R = 1;
+                }
 
-            double stds = 1/2. * sqrt(-2 * log(R));
+                double res = atan2(sin_mean, cos_mean);
+                if(res < 0){
+                     res += 2 * M_PI;
+                }
 
-            double res = atan2(sin_mean, cos_mean);
-            if(res < 0){
-                 res += 2 * M_PI;
+                *(means) = res / scale + low;
+                *(stds) = (1 / scale) * sqrt(-2 * log(R));
             }
-
-            *(means) = res*(high - low)/2.0/M_PI + low;
-            *(stds) = ((high - low)/2.0/M_PI) * sqrt(-2*log(R));
         }
     ''')
 
@@ -77,12 +107,12 @@ def fit_circular_gaussian(samples, high=np.pi, low=0):
         data = {'samples': Array(samples, 'mot_float_type'),
                 'means': Zeros(samples.shape[0], 'mot_float_type'),
                 'stds': Zeros(samples.shape[0], 'mot_float_type'),
-                'nmr_samples': Scalar(samples.shape[1]),
                 'low': Scalar(low),
                 'high': Scalar(high),
+                'scratch': LocalMemory('double'),
                 }
 
-        cl_func.evaluate(data, samples.shape[0])
+        get_cl_function(samples.shape[1]).evaluate(data, samples.shape[0], use_local_reduction=True)
         return data['means'].get_data(), data['stds'].get_data()
 
     if len(samples.shape) == 1:
@@ -31,3 +31,19 @@ class test_ErrorFunctions(unittest.TestCase):
         opencl_results = dawson().evaluate({'x': x}, x.shape[0])
 
         assert_allclose(opencl_results, python_results, atol=1e-5, rtol=1e-5)
+
+    def test_erfi_fast(self):
+        x = np.linspace(-3, 3)
+
+        python_results = scipy.special.erfi(x)
+        opencl_results = erfi(fast=True).evaluate({'x': x}, x.shape[0])
+
+        assert_allclose(opencl_results, python_results, atol=1e-5, rtol=1e-5)
+
+    def test_dawson_fast(self):
+        x = np.concatenate([np.linspace(-15, 15, num=1000), [-1e20, -1e6, 1e6, 1e20]])
+
+        python_results = scipy.special.dawsn(x)
+        opencl_results = dawson(fast=True).evaluate({'x': x}, x.shape[0])
+
+        assert_allclose(opencl_results, python_results, atol=1e-7, rtol=1e-6)
@@ -0,0 +1,47 @@
+import unittest
+import numpy as np
+from numpy.testing import assert_allclose
+from mot.lib.cl_function import SimpleCLFunction
+from mot.lib.kernel_data import Array
+from mot.library_functions import EuclidianNormFunction
+
+__author__ = 'Robbert Harms'
+__date__ = '2020-02-14'
+__maintainer__ = 'Robbert Harms'
+__email__ = 'robbert@xkls.nl'
+__licence__ = 'LGPL v3'
+
+
+class test_EuclidianNorm(unittest.TestCase):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def test_norm(self):
+        for memspace in ['global', 'private']:
+            for n in [1, 3, 4, 13]:
+                x = np.random.uniform(-10, 10, size=(5, n))
+                self._assert_norm(EuclidianNormFunction(memspace, 'double'), x)
+
+    def test_extreme_values(self):
+        x = np.array([[1e200, 1e200, 3e199, 0, 0],
+                      [1e-200, 2e-200, 0, 0, 3e-200],
+                      [0, 0, 0, 0, 0],
+                      [1e150, 1, 0, 0, 1e-150]])
+        self._assert_norm(EuclidianNormFunction('global', 'double'), x)
+
+    def test_previous_name(self):
+        x = np.random.uniform(-10, 10, size=(5, 7))
+        func = SimpleCLFunction.from_string('''
+            double norm(global const double* const x, const int n){
+                return euclidian_norm_global(x, n);
+            }
+        ''', dependencies=[EuclidianNormFunction('global', 'double')])
+        opencl_results = func.evaluate({'x': Array(x, 'double', mode='r'), 'n': x.shape[1]}, x.shape[0])
+        assert_allclose(opencl_results, np.linalg.norm(x, axis=1), rtol=1e-12)
+
+    def _assert_norm(self, enorm, x):
+        scale = np.max(np.abs(x), axis=1)[:, None]
+        python_results = np.squeeze(scale) * np.linalg.norm(x / np.where(scale == 0, 1, scale), axis=1)
+        opencl_results = enorm.evaluate({'x': Array(x, 'double', mode='r'), 'n': x.shape[1]}, x.shape[0])
+        assert_allclose(opencl_results, python_results, rtol=1e-12)
@@ -0,0 +1,31 @@
+import unittest
+import numpy as np
+import scipy.special
+from numpy.testing import assert_allclose
+from mot.library_functions import FirstLegendreTerm
+
+__author__ = 'Robbert Harms'
+__date__ = '2020-02-14'
+__maintainer__ = 'Robbert Harms'
+__email__ = 'robbert@xkls.nl'
+__licence__ = 'LGPL v3'
+
+
+class test_LegendrePolynomial(unittest.TestCase):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def test_first_legendre_term(self):
+        x = np.concatenate([np.linspace(-1, 1, num=101), [-1, 1]])
+
+        for n in range(0, 12):
+            python_results = scipy.special.eval_legendre(n, x)
+            opencl_results = FirstLegendreTerm().evaluate({'x': x, 'n': n}, x.shape[0])
+
+            assert_allclose(opencl_results, python_results, atol=1e-12, rtol=1e-12)
+
+    def test_negative_degree(self):
+        x = np.linspace(-1, 1, num=11)
+        opencl_results = FirstLegendreTerm().evaluate({'x': x, 'n': -1}, x.shape[0])
+        assert_allclose(opencl_results, 0)
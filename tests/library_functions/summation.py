@@ -0,0 +1,41 @@
+import math
+import unittest
+import numpy as np
+from numpy.testing import assert_allclose
+from mot.lib.cl_function import SimpleCLFunction
+from mot.lib.kernel_data import Array
+from mot.library_functions import PairwiseSummation, InterleavedKahanSummation
+
+__author__ = 'Robbert Harms'
+__date__ = '2020-02-12'
+__maintainer__ = 'Robbert Harms'
+__email__ = 'robbert@xkls.nl'
+__licence__ = 'LGPL v3'
+
+
+class test_Summation(unittest.TestCase):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def test_pairwise_summation(self):
+        self._test_summation(PairwiseSummation('global', 'double'))
+
+    def test_interleaved_kahan_summation(self):
+        self._test_summation(InterleavedKahanSummation('global', 'double'))
+
+    def _test_summation(self, summation_func):
+        func = SimpleCLFunction.from_string('''
+            double sum_values(global double* values, uint n){
+                return ''' + summation_func.get_cl_function_name() + '''(values, n);
+            }
+        ''', dependencies=[summation_func])
+
+        for n in [0, 1, 7, 8, 9, 64, 1001, 4099]:
+            values = np.random.uniform(-1e3, 1e3, size=(3, max(n, 1)))
+
+            python_results = [math.fsum(row[:n]) for row in values]
+            opencl_results = func.evaluate({'values': Array(values, 'double', mode='r'), 'n': np.uint32(n)},
+                                           values.shape[0])
+
+            assert_allclose(opencl_results, python_results, atol=1e-8, rtol=1e-12)
@@ -12,7 +12,9 @@ import unittest
 import numpy as np
 
 from mot import minimize
+from mot.cl_routines import compute_objective_value, compute_log_likelihood
 from mot.lib.cl_function import SimpleCLFunction
+from mot.lib.kernel_data import Zeros
 
 
 class CLRoutineTestCase(unittest.TestCase):
@@ -90,5 +92,75 @@ class TestLSQNonLinExample(CLRoutineTestCase):
                 self.assertAlmostEqual(v[0, ind], 0.2578, places=3, msg=method)
 
 
+class TestComputeObjectiveValue(CLRoutineTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self._objective_func = SimpleCLFunction.from_string('''
+            double sum_of_squares(local const mot_float_type* const x,
+                                  void* data,
+                                  local mot_float_type* objective_list){
+                return x[0] * x[0] + x[1] * x[1];
+            }
+        ''')
+
+    def test_reused_buffer(self):
+        buffer = Zeros((3,), 'mot_float_type')
+
+        first_params = np.array([[1, 2], [3, 4], [5, 6]], dtype=np.float64)
+        second_params = np.array([[0, 1], [1, 1], [2, 2]], dtype=np.float64)
+
+        first = compute_objective_value(self._objective_func, first_params, objective_values=buffer)
+        second = compute_objective_value(self._objective_func, second_params, objective_values=buffer)
+
+        np.testing.assert_allclose(first, [5, 25, 61])
+        np.testing.assert_allclose(second, [1, 2, 8])
+
+
+class TestComputeLogLikelihood(CLRoutineTestCase):
+
+    def _get_ll_func(self, nmr_params):
+        return SimpleCLFunction.from_string('''
+            double weighted_squares_ll(local const mot_float_type* const x, void* data){
+                double sum = 0;
+                for(uint i = 0; i < ''' + str(nmr_params) + '''; i++){
+                    sum += (i + 1) * x[i] * x[i];
+                }
+                return -sum;
+            }
+        ''')
+
+    def _expected_ll(self, parameters):
+        weights = np.arange(1, parameters.shape[1] + 1).reshape((1, -1) + (1,) * (parameters.ndim - 2))
+        return -np.sum(weights * parameters ** 2, axis=1)
+
+    def _check(self, shape):
+        parameters = np.random.RandomState(0).uniform(-1, 1, shape)
+        lls = compute_log_likelihood(self._get_ll_func(shape[1]), parameters)
+        np.testing.assert_allclose(lls, self._expected_ll(parameters), rtol=1e-5, atol=1e-5)
+
+    def test_optimization_parameters(self):
+        self._check((10, 4))
+
+    def test_sampled_parameters_few(self):
+        self._check((10, 4, 15))
+
+    def test_sampled_parameters_many(self):
+        self._check((5, 40, 15))
+
+    def test_sampled_parameters_multiple_tiles(self):
+        self._check((3, 4, 2100))
+
+    def test_sampled_matches_optimization(self):
+        parameters = np.random.RandomState(1).uniform(-1, 1, (6, 3, 4))
+        ll_func = self._get_ll_func(3)
+
+        sampled_lls = compute_log_likelihood(ll_func, parameters)
+        for sample_ind in range(parameters.shape[2]):
+            np.testing.assert_allclose(sampled_lls[:, sample_ind],
+                                       compute_log_likelihood(ll_func, np.copy(parameters[..., sample_ind])),
+                                       rtol=1e-5, atol=1e-5)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+import numpy as np
+from numpy.testing import assert_allclose
+from mot.random import uniform, normal
+
+__author__ = 'Robbert Harms'
+__date__ = '2020-02-14'
+__maintainer__ = 'Robbert Harms'
+__email__ = 'robbert@xkls.nl'
+__licence__ = 'LGPL v3'
+
+
+class test_Random(unittest.TestCase):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def test_uniform(self):
+        for ctype in ['float', 'double', 'mot_float_type']:
+            for nmr_samples in [1, 4, 1001]:
+                samples = uniform(3, nmr_samples, low=2, high=5, ctype=ctype, seed=0)
+                self.assertEqual(samples.shape, (3, nmr_samples))
+                self.assertTrue(np.all((samples >= 2) & (samples <= 5)))
+
+            samples = uniform(2, 10000, low=2, high=5, ctype=ctype, seed=0)
+            assert_allclose(np.mean(samples, axis=1), 3.5, atol=0.05)
+
+    def test_normal(self):
+        for ctype in ['float', 'double', 'mot_float_type']:
+            for nmr_samples in [1, 4, 1001]:
+                samples = normal(3, nmr_samples, mean=1, std=2, ctype=ctype, seed=0)
+                self.assertEqual(samples.shape, (3, nmr_samples))
+                self.assertTrue(np.all(np.isfinite(samples)))
+
+            samples = normal(2, 10000, mean=1, std=2, ctype=ctype, seed=0)
+            assert_allclose(np.mean(samples, axis=1), 1, atol=0.1)
+            assert_allclose(np.std(samples, axis=1), 2, atol=0.1)
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_stats
+----------------------------------
+
+Tests for the `mot.stats` module.
+"""
+
+import unittest
+import numpy as np
+from scipy.stats import circmean, circstd
+
+from mot.configuration import config_context, RuntimeConfigurationAction
+from mot.stats import fit_circular_gaussian
+
+
+class test_fit_circular_gaussian(unittest.TestCase):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def test_scipy_equivalence(self):
+        random_state = np.random.RandomState(0)
+
+        for high, low in [(np.pi, 0), (30, -10)]:
+            for nmr_samples in [1, 3, 5, 64, 1001]:
+                samples = random_state.uniform(low, high, (4, nmr_samples))
+
+                with config_context(RuntimeConfigurationAction(double_precision=True)):
+                    means, stds = fit_circular_gaussian(samples, high=high, low=low)
+
+                msg = 'high: {}, low: {}, nmr_samples: {}'.format(high, low, nmr_samples)
+                np.testing.assert_allclose(means, circmean(samples, high=high, low=low, axis=1),
+                                           atol=1e-7, err_msg=msg)
+                np.testing.assert_allclose(stds, circstd(samples, high=high, low=low, axis=1),
+                                           atol=1e-7, err_msg=msg)
+
+    def test_one_dimensional(self):
+        samples = np.random.RandomState(1).uniform(0, np.pi, 100)
+
+        with config_context(RuntimeConfigurationAction(double_precision=True)):
+            mean, std = fit_circular_gaussian(samples)
+
+        self.assertAlmostEqual(mean, circmean(samples, high=np.pi), places=7)
+        self.assertAlmostEqual(std, circstd(samples, high=np.pi), places=7)
+
+
+if __name__ == '__main__':
+    unittest.main()